@@ -1,53 +1,120 @@
 import sys
-import json
-import pandas as pd
-from selenium import webdriver
 import time
 import os
+from collections import deque
 from pathlib import Path
-from datetime import datetime
 
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QWidget,
     QVBoxLayout, QHBoxLayout,
-    QLabel, QLineEdit, QPushButton,
-    QTextEdit, QMessageBox
+    QLabel, QLineEdit, QPushButton, QListView,
+    QPlainTextEdit, QMessageBox, QCheckBox, QProgressBar
 )
 from database import (
-    insert_li_person,
-    upsert_li_person_master,
+    generate_task_id,
+    write_profiles,
     prepare_profile_for_db
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QMutex
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QTimer
 from PyQt6.QtGui import QFont
 
-from scraper import start_scrap
+from exporters import ExportSession, export_excel
+from freshness import FreshnessCache
+from metrics import REGISTRY
+from result_model import ProfileListModel
+from search_index import SearchIndex
+from throttle import AdaptiveThrottle
+from write_behind import WriteBehindQueue
 
-LINKEDIN_URL = "https://www.linkedin.com/"
+# The log view drops its oldest lines past this many.
+LOG_LINES = 2000
 
-class ScraperWorker(QThread):
+class ScrapeSignals(QObject):
     log_signal = pyqtSignal(str)
-    result_signal = pyqtSignal(dict)
+    result_signal = pyqtSignal(object)
     finished_signal = pyqtSignal()
 
-    def __init__(self, driver, profile_url, mutex):
-        super().__init__()
-        self.driver = driver
-        self.profile_url = profile_url
-        self.mutex = mutex
 
-    def run(self):
-        self.mutex.lock()
+def submit_scrape(scheduler, signals, profile_url, snapshot=True, deep=False, force=False):
+    timings = {}
+    future = scheduler.submit(profile_url, force=force, snapshot=snapshot, deep=deep, timings=timings)
+    signals.log_signal.emit(f"Scraping queued: {profile_url}")
+
+    # Runs on a pool thread; the signals queue the updates back onto the GUI thread.
+    def done(future):
         try:
-            self.log_signal.emit(f"Scraping started: {self.profile_url}")
-            data = start_scrap(self.driver, self.profile_url)
-            self.result_signal.emit(data)
-            self.log_signal.emit("Scraping completed ✔")
+            profile = future.result()
+            if profile is None:
+                signals.log_signal.emit(f"Skipped, captured recently: {profile_url}")
+                return
+            # Seconds, plus scroll and item counts from deep mode's details pages.
+            signals.log_signal.emit("Timings: " + ", ".join(
+                f"{name.removeprefix('wait_')} {value:.2f}s" if isinstance(value, float)
+                else f"{name} {value}"
+                for name, value in timings.items()
+            ))
+            signals.result_signal.emit(profile)
+            signals.log_signal.emit(f"Scraping completed ✔ {profile_url}")
         except Exception as e:
-            self.log_signal.emit(f"Error: {e}")
+            signals.log_signal.emit(f"Error: {e}")
         finally:
-            self.mutex.unlock()
-            self.finished_signal.emit()
+            signals.finished_signal.emit()
+
+    future.add_done_callback(done)
+    return future
+
+
+# Starts the first browser off the GUI thread. selenium is imported here too,
+# so neither the import nor Chrome's launch delays the first window. The
+# browser comes back logged in from its profile or the saved cookies, or on the
+# login page when it needs a person to log in.
+class BrowserLauncher(QThread):
+    progress_signal = pyqtSignal(int, str)
+    ready_signal = pyqtSignal(object, object, bool)
+    failed_signal = pyqtSignal(str)
+
+    STEPS = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = None
+
+    def run(self):
+        try:
+            self.progress_signal.emit(0, "Loading browser modules")
+            from browser import create_driver
+            from driver_pool import DriverPool
+            from session import LOGIN_URL, session_valid
+
+            self.progress_signal.emit(1, "Starting Chrome and checking the LinkedIn session")
+            self.pool = DriverPool(create_driver)
+            # The one browser that may start logged out: the user logs in with it.
+            driver = self.pool.acquire(require_session=False)
+
+            logged_in = session_valid(driver)
+            if not logged_in:
+                self.progress_signal.emit(2, "Opening LinkedIn login")
+                driver.get(LOGIN_URL)
+        except Exception as e:
+            self.failed_signal.emit(str(e))
+            return
+        self.progress_signal.emit(3, "Browser ready")
+        self.ready_signal.emit(self.pool, driver, logged_in)
+
+
+class WriteSignals(QObject):
+    queued_signal = pyqtSignal(str)
+    written_signal = pyqtSignal(str)
+    failed_signal = pyqtSignal(str, str)
+
+
+def save_profile(item):
+    profile, task_id = item
+    write_profiles([(prepare_profile_for_db(profile), task_id)])
+
+
+def profile_name(item):
+    return item[0].name or "Unknown"
 
 
 class LinkedInScraperUI(QMainWindow):
@@ -56,21 +123,51 @@ class LinkedInScraperUI(QMainWindow):
         self.setWindowTitle("LinkedIn Profile Scraper")
         self.setMinimumSize(1200, 650)
 
-        self.driver = None
-        self.worker = None
-        self.driver_mutex = QMutex()
+        self.pool = None
+        self.launcher = None
+        self.scheduler = None
+        self.in_flight = 0
         self.is_logged_in = False
 
-        self.scraped_data_list = []
-        self.scraped_names = []
+        self.signals = ScrapeSignals()
+        self.signals.log_signal.connect(self.log)
+        self.signals.result_signal.connect(self.handle_result)
+        self.signals.finished_signal.connect(self.scraping_done)
+
+        # Database writes run behind the GUI; results wait in write_backlog
+        # while the bounded write queue is full.
+        self.write_signals = WriteSignals()
+        self.write_signals.queued_signal.connect(self.write_queued)
+        self.write_signals.written_signal.connect(self.write_written)
+        self.write_signals.failed_signal.connect(self.write_failed)
+        self.writer = WriteBehindQueue(
+            save_profile,
+            on_queued=lambda item: self.write_signals.queued_signal.emit(profile_name(item)),
+            on_written=self.profile_saved,
+            on_failed=lambda item, e: self.write_signals.failed_signal.emit(profile_name(item), str(e))
+        )
+        self.write_backlog = deque()
+        # Profiles count as captured once they are in the database.
+        self.freshness = FreshnessCache()
+        self.db_counts = {"queued": 0, "written": 0, "failed": 0}
 
         self.save_dir = self.create_save_dir()
+        # Flattened and written on the export thread, batched when results
+        # arrive faster than it writes.
+        self.exports = ExportSession(
+            str(self.save_dir), background=True,
+            on_error=lambda e: self.signals.log_signal.emit(f"Export error ❌ {e}")
+        )
+        # Kept across sessions, so searches cover every profile scraped here.
+        self.search_index = SearchIndex(str(self.save_dir / "profile_search.sqlite3"))
         self.init_ui()
+        for name, error in self.exports.errors.items():
+            self.log(f"{name} export disabled: {error}")
 
     # ---------------- SAVE DIRECTORY ----------------
     def create_save_dir(self):
         base = Path.home() / "Desktop" / "LinkedIn Profile Scraper"
-        for f in ["JSON Files", "Excel Files", "CSV Files", "Profiles"]:
+        for f in ["JSON Files", "Excel Files", "CSV Files", "Parquet Files", "Profiles"]:
             (base / f).mkdir(parents=True, exist_ok=True)
         return base
 
@@ -87,12 +184,25 @@ class LinkedInScraperUI(QMainWindow):
         self.url_input = QLineEdit()
         self.url_input.setPlaceholderText("Paste LinkedIn profile URL")
 
+        self.snapshot_check = QCheckBox("Fast parsing (single page snapshot)")
+        self.snapshot_check.setChecked(True)
+
+        self.deep_check = QCheckBox("Deep capture (all roles and skills, two more page loads)")
+
+        self.force_check = QCheckBox("Force refresh (ignore recent captures)")
+
         self.start_btn = QPushButton("Start Scraping")
         self.start_btn.setEnabled(False)
         self.start_btn.clicked.connect(self.start_scraping)
 
-        self.log_box = QTextEdit()
+        self.startup_progress = QProgressBar()
+        self.startup_progress.setRange(0, BrowserLauncher.STEPS)
+        self.startup_progress.setFormat("Launching browser...")
+        self.startup_progress.hide()
+
+        self.log_box = QPlainTextEdit()
         self.log_box.setReadOnly(True)
+        self.log_box.setMaximumBlockCount(LOG_LINES)
 
         # Download buttons
         self.download_json = QPushButton("Download JSON")
@@ -109,7 +219,11 @@ class LinkedInScraperUI(QMainWindow):
         left.addWidget(title)
         left.addWidget(QLabel("Profile URL"))
         left.addWidget(self.url_input)
+        left.addWidget(self.snapshot_check)
+        left.addWidget(self.deep_check)
+        left.addWidget(self.force_check)
         left.addWidget(self.start_btn)
+        left.addWidget(self.startup_progress)
         left.addWidget(QLabel("Logs"))
         left.addWidget(self.log_box)
         left.addWidget(self.download_json)
@@ -117,9 +231,22 @@ class LinkedInScraperUI(QMainWindow):
         left.addWidget(self.download_csv)
 
         # RIGHT PANEL
-        self.result_box = QTextEdit()
-        self.result_box.setReadOnly(True)
-        self.result_box.setPlaceholderText("Scraped profile names will appear here")
+        # Paged from the search index, so only the rows on screen are loaded.
+        self.results = ProfileListModel(self.search_index, self)
+        self.result_list = QListView()
+        self.result_list.setModel(self.results)
+        self.result_list.setUniformItemSizes(True)
+
+        # 🔹 SEARCH
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Search profiles: name, headline, job title, company, skill")
+        self.search_input.textChanged.connect(lambda: self.search_timer.start())
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.search_status = QLabel(f"{self.results.rowCount()} profiles indexed")
+        self.search_status.setStyleSheet("font-size:10px;color:#555;")
 
         # 🔹 SAVE PATH LABEL
         self.path_label = QLabel(
@@ -135,8 +262,27 @@ class LinkedInScraperUI(QMainWindow):
         self.open_folder_btn = QPushButton("📂 Open Save Folder")
         self.open_folder_btn.clicked.connect(self.open_save_folder)
 
+        self.db_status = QLabel()
+        self.update_db_status()
+
         right.addWidget(QLabel("Scraped Profiles"))
-        right.addWidget(self.result_box)
+        right.addWidget(self.search_input)
+        right.addWidget(self.search_status)
+        right.addWidget(self.result_list)
+        right.addWidget(self.db_status)
+
+        # 🔹 METRICS PANEL
+        self.metrics_panel = QLabel("No timings yet")
+        self.metrics_panel.setStyleSheet(
+            "font-family:monospace;font-size:10px;padding:8px;"
+            "background:#f7f7f7;border:1px solid #ddd;border-radius:5px;"
+        )
+        right.addWidget(QLabel("Stage Timings"))
+        right.addWidget(self.metrics_panel)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics)
+        self.metrics_timer.start(2000)
         right.addWidget(self.path_label)
         right.addWidget(self.open_folder_btn)
 
@@ -150,26 +296,61 @@ class LinkedInScraperUI(QMainWindow):
     # ---------------- STARTUP ----------------
     def showEvent(self, event):
         super().showEvent(event)
-        QTimer.singleShot(500, self.init_driver)
+        if self.launcher is None:
+            QTimer.singleShot(0, self.init_driver)
 
     def init_driver(self):
         self.log("Initializing browser...")
-        self.driver = webdriver.Chrome()
-        self.driver.get(LINKEDIN_URL)
-
-        reply = QMessageBox.question(
-            self,
-            "Login Required",
-            "Please login to LinkedIn in the browser.\nClick YES after login.",
-            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        self.startup_progress.setValue(0)
+        self.startup_progress.show()
+        self.launcher = BrowserLauncher(self)
+        self.launcher.progress_signal.connect(self.browser_progress)
+        self.launcher.ready_signal.connect(self.browser_ready)
+        self.launcher.failed_signal.connect(self.browser_failed)
+        self.launcher.start()
+
+    def browser_progress(self, step, message):
+        self.startup_progress.setValue(step)
+        self.startup_progress.setFormat(message)
+
+    def browser_failed(self, error):
+        self.startup_progress.hide()
+        self.log(f"Browser failed to start ❌ {error}")
+
+    def browser_ready(self, pool, driver, logged_in):
+        from driver_pool import ScrapeScheduler
+        from session import save_cookies, session_valid
+
+        self.startup_progress.hide()
+        self.pool = pool
+
+        # Interactive login only when neither the browser profile nor the saved
+        # cookies had a valid session.
+        while not logged_in:
+            reply = QMessageBox.question(
+                self,
+                "Login Required",
+                "Please login to LinkedIn in the browser.\nClick YES after login.",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                self.pool.release(driver)
+                self.close()
+                return
+            logged_in = session_valid(driver)
+            if logged_in:
+                # The other pooled browsers log in with this session's cookies.
+                save_cookies(driver)
+            else:
+                self.log("Not logged in yet ❌")
+
+        self.pool.release(driver)
+        self.scheduler = ScrapeScheduler(
+            self.pool, freshness=self.freshness, throttle=AdaptiveThrottle()
         )
-
-        if reply == QMessageBox.StandardButton.Yes:
-            self.is_logged_in = True
-            self.start_btn.setEnabled(True)
-            self.log("Login confirmed ✔")
-        else:
-            self.close()
+        self.is_logged_in = True
+        self.start_btn.setEnabled(True)
+        self.log(f"Logged in ✔ ({self.pool.size} browsers)")
 
     # ---------------- SCRAPING ----------------
     def start_scraping(self):
@@ -178,128 +359,173 @@ class LinkedInScraperUI(QMainWindow):
             QMessageBox.warning(self, "Error", "Enter profile URL")
             return
 
-        self.start_btn.setEnabled(False)
         self.url_input.clear()
-
-        self.worker = ScraperWorker(self.driver, url, self.driver_mutex)
-        self.worker.log_signal.connect(self.log)
-        self.worker.result_signal.connect(self.handle_result)
-        self.worker.finished_signal.connect(self.scraping_done)
-        self.worker.start()
+        self.in_flight += 1
+        submit_scrape(
+            self.scheduler, self.signals, url,
+            snapshot=self.snapshot_check.isChecked(),
+            deep=self.deep_check.isChecked(),
+            force=self.force_check.isChecked()
+        )
         
-    def generate_task_id(self,prefix="LI_PERSON"):
-        now = datetime.now()
-        timestamp = now.strftime("%Y%m%d%H%M%S")
-        milliseconds = f"{now.microsecond // 1000:03d}"
-        return f"{prefix}_{timestamp}{milliseconds}"
-
-    def handle_result(self, data):
+    def handle_result(self, profile):
+        self.exports.append(profile)
         try:
-            profile = prepare_profile_for_db(data)
-
-            task_id = self.generate_task_id()
-            
-            insert_li_person(profile,task_id)
-            upsert_li_person_master(profile,task_id)
-
-            self.scraped_data_list.append(data)
-            name = data.get("basic_info", {}).get("name", "Unknown")
-            self.scraped_names.append(name)
-            self.result_box.setText("\n".join(self.scraped_names))
-
-            self.download_json.setEnabled(True)
-            self.download_excel.setEnabled(True)
-            self.download_csv.setEnabled(True)
-
-            self.log("Saved to database ✔")
+            added = self.search_index.add(profile)
+        except Exception as e:
+            self.log(f"Search index error ❌ {e}")
+        else:
+            if self.search_input.text().strip():
+                self.run_search()
+            else:
+                self.show_indexed(added)
+
+        self.download_json.setEnabled(True)
+        self.download_excel.setEnabled(True)
+        self.download_csv.setEnabled(True)
+
+        self.write_backlog.append((profile, generate_task_id()))
+        self.drain_write_backlog()
+
+    # ---------------- SEARCH ----------------
+    def show_indexed(self, added):
+        scrollbar = self.result_list.verticalScrollBar()
+        following = scrollbar.value() == scrollbar.maximum()
+        self.results.profiles_indexed(added)
+        self.search_status.setText(f"{self.results.rowCount()} profiles indexed")
+        if following:
+            self.result_list.scrollToBottom()
+
+    def run_search(self):
+        query = self.search_input.text().strip()
+        if not query:
+            self.results.show_all()
+            self.search_status.setText(f"{self.results.rowCount()} profiles indexed")
+            return
 
+        started = time.perf_counter()
+        try:
+            hits = self.search_index.search(query)
         except Exception as e:
-            self.log(f"Database error ❌ {e}")
+            self.search_status.setText(f"Search error: {e}")
+            return
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.search_status.setText(f"{len(hits)} results in {elapsed:.1f} ms")
+        self.results.show_hits(hits)
+
+    # ---------------- DATABASE WRITES ----------------
+    def drain_write_backlog(self):
+        while self.write_backlog and self.writer.submit(self.write_backlog[0], block=False):
+            self.write_backlog.popleft()
+
+        # Backpressure: take no new URLs while the database is behind.
+        self.start_btn.setEnabled(self.is_logged_in and not self.write_backlog)
+        if self.write_backlog:
+            self.log(f"Database is behind, {len(self.write_backlog)} results waiting")
+
+    def profile_saved(self, item):
+        # Runs on the write-behind thread.
+        self.freshness.mark(item[0].profile_url)
+        self.write_signals.written_signal.emit(profile_name(item))
+
+    def write_queued(self, name):
+        self.db_counts["queued"] += 1
+        self.update_db_status()
+
+    def write_written(self, name):
+        self.db_counts["queued"] -= 1
+        self.db_counts["written"] += 1
+        self.log(f"Saved to database ✔ {name}")
+        self.update_db_status()
+        self.drain_write_backlog()
+
+    def write_failed(self, name, error):
+        self.db_counts["queued"] -= 1
+        self.db_counts["failed"] += 1
+        self.log(f"Database error ❌ {name}: {error}")
+        self.update_db_status()
+        self.drain_write_backlog()
+
+    def finish_writes(self):
+        # Results still in write_backlog were only reported as waiting; ask
+        # before dropping them instead of losing them silently.
+        unsaved = len(self.write_backlog) + self.writer.pending()
+        if unsaved:
+            reply = QMessageBox.question(
+                self,
+                "Unsaved Results",
+                f"{unsaved} results are not in the database yet.\n"
+                "Wait for them to be saved before closing?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
+                # The writer thread is a daemon; it stops with the process.
+                return
+        while self.write_backlog:
+            # Blocks while the write queue is full.
+            self.writer.submit(self.write_backlog.popleft())
+        self.writer.close()
+
+    def update_db_status(self):
+        counts = self.db_counts
+        self.db_status.setText(
+            f"Database: {counts['queued'] + len(self.write_backlog)} queued, "
+            f"{counts['written']} written, {counts['failed']} failed"
+        )
 
     def scraping_done(self):
-        self.worker.quit()
-        self.worker.wait()
-        self.worker = None
-        self.start_btn.setEnabled(True)
-        self.log("Ready for next profile")
+        self.in_flight -= 1
+        if not self.in_flight:
+            self.log("Ready for next profile")
+
+    # ---------------- METRICS ----------------
+    def update_metrics(self):
+        stages = REGISTRY.stage_summary()
+        if not stages:
+            return
+        lines = [f"{'stage':<28}{'count':>7}{'mean s':>9}{'max s':>9}"]
+        for stage, (count, mean, longest) in sorted(stages.items()):
+            lines.append(f"{stage:<28}{count:>7}{mean:>9.2f}{longest:>9.2f}")
+        lines.append("")
+        lines.append(
+            f"driver calls {REGISTRY.counter_total('driver_calls_total'):g}, "
+            f"retries {REGISTRY.counter_total('retries_total'):g}, "
+            f"failures {REGISTRY.counter_total('failures_total'):g}"
+        )
+        if self.scheduler and self.scheduler.throttle:
+            state = self.scheduler.throttle.state()
+            lines.append(
+                f"rate {state['rate_per_hour']:.0f}/h, "
+                f"throttled {REGISTRY.counter_total('throttled_total'):g}"
+                + (f", paused {state['cooldown']:.0f}s" if state["cooldown"] else "")
+            )
+        self.metrics_panel.setText("\n".join(lines))
+        try:
+            REGISTRY.write(str(self.save_dir / "metrics.prom"))
+        except OSError as e:
+            self.log(f"Could not write metrics file: {e}")
 
     # ---------------- SAVE FILES ----------------
+    # Results are appended to the session's JSONL/CSV/Parquet files as they
+    # arrive; the buttons only report or convert what is already on disk.
     def save_json(self):
-        path = self.save_dir / "JSON Files" / f"profiles_{int(time.time())}.json"
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self.scraped_data_list, f, indent=4, ensure_ascii=False)
-        self.log(f"Saved JSON → {path.name}")
+        self.log(f"JSON Lines file → {self.exports.path('jsonl')}")
 
     def save_excel(self):
         path = self.save_dir / "Excel Files" / f"profiles_{int(time.time())}.xlsx"
-        
-        rows = []
-        
-        for profile  in self.scraped_data_list:
-            basic = profile .get('basic_info',{})
-            experience_list = profile.get('experience',{})
-            skills = profile.get("skills", [])
-            
-            first_exp = experience_list[0] if experience_list else {}
-
-            rows.append({
-                "Name":basic.get("name",""),
-                "Headline":basic.get("headline",""),
-                "Location":basic.get("location",""),
-                "Connections":basic.get("connections",""),
-                "Last Activity":basic.get("last_activity",""),
-                "Job Title":first_exp.get("job_title",""),
-                "Profile URL":basic.get("profile_url",""),
-                "Job Title":basic.get("job_title",""),
-                "Company Name": first_exp.get("company_name", ""),
-                "Company Link": first_exp.get("company_link", ""),
-                "Company Location": first_exp.get("location", ""),
-                "Work Mode": first_exp.get("work_mode", ""),
-                "Total Duration": first_exp.get("total_duration", first_exp.get("duration", ""),),
-                "Job Type": first_exp.get("job_type", ""),
-                "Duration": first_exp.get("duration", ""),
-                "Tenurity": first_exp.get("tenurity", ""),
-                "Skills": ", ".join(skills),
-                "Experience": json.dumps(experience_list, ensure_ascii=False)
-                
-            })
-        df = pd.DataFrame(rows)
-        df.to_excel(path, index=False)
-        self.log(f"Saved Excel → {path.name}")
+        source = self.exports.path("csv")
+
+        # On the export thread, after every row already appended.
+        def convert():
+            export_excel(source, str(path))
+            self.signals.log_signal.emit(f"Saved Excel → {path.name}")
+
+        self.log("Building Excel file...")
+        self.exports.run(convert)
 
     def save_csv(self):
-        path = self.save_dir / "CSV Files" / f"profiles_{int(time.time())}.csv"
-        rows = []
-        
-        for profile  in self.scraped_data_list:
-            basic = profile .get('basic_info',{})
-            experience_list = profile.get('experience',{})
-            skills = profile.get("skills", [])
-            
-            first_exp = experience_list[0] if experience_list else {}
-
-            rows.append({
-                "Name":basic.get("name",""),
-                "Headline":basic.get("headline",""),
-                "Location":basic.get("location",""),
-                "Connections":basic.get("connections",""),
-                "Last Activity":basic.get("last_activity",""),
-                "Job Title":first_exp.get("job_title",""),
-                "Company Name": first_exp.get("company_name", ""),
-                "Company Link": first_exp.get("company_link", ""),
-                "Company Location": first_exp.get("location", ""),
-                "Work Mode": first_exp.get("work_mode", ""),
-                "Total Duration": first_exp.get("total_duration", first_exp.get("duration", ""),),
-                "Job Type": first_exp.get("job_type", ""),
-                "Duration": first_exp.get("duration", ""),
-                "Tenurity": first_exp.get("tenurity", ""),
-                "Skills": ", ".join(skills),
-                "Experience": json.dumps(experience_list, ensure_ascii=False)
-                
-            })
-        df = pd.DataFrame(rows)
-        df.to_csv(path, index=False)
-        self.log(f"Saved CSV → {path.name}")
+        self.log(f"CSV file → {self.exports.path('csv')}")
 
     # ---------------- OPEN FOLDER ----------------
     def open_save_folder(self):
@@ -312,12 +538,21 @@ class LinkedInScraperUI(QMainWindow):
 
     # ---------------- LOG ----------------
     def log(self, msg):
-        self.log_box.append(f"[{time.strftime('%H:%M:%S')}] {msg}")
+        self.log_box.appendPlainText(f"[{time.strftime('%H:%M:%S')}] {msg}")
 
     # ---------------- CLOSE ----------------
     def closeEvent(self, event):
-        if self.driver:
-            self.driver.quit()
+        if self.launcher and self.launcher.isRunning():
+            # Closed while Chrome was still starting; wait so it can be shut down.
+            self.launcher.wait()
+        if self.pool is None and self.launcher:
+            self.pool = self.launcher.pool
+        self.finish_writes()
+        self.exports.close()
+        if self.scheduler:
+            self.scheduler.shutdown(wait=False)
+        elif self.pool:
+            self.pool.close()
         event.accept()
 
 
@@ -0,0 +1,286 @@
+import os
+from html import escape
+
+
+# Builds the HTML fixtures in benchmarks/fixtures. The markup mirrors the
+# structure the absolute XPaths in scraper.py expect from a LinkedIn profile
+# page, including the visually-hidden duplicates LinkedIn renders for screen
+# readers. Re-run after changing an XPath:  python benchmarks/build_fixtures.py
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+DETAILS_DIR = os.path.join(FIXTURE_DIR, "details")
+DETAILS_PAGE_SIZE = 20
+
+
+def text(value):
+    return (
+        f'<span aria-hidden="true">{escape(value)}</span>'
+        f'<span class="visually-hidden">{escape(value)}</span>'
+    )
+
+
+def heading(title, extra=""):
+    return (
+        f'<div id="{title.lower()}" class="pv-profile-card__anchor"></div>'
+        f'<div><div><div><div><h2 class="pvs-header__title">{text(title)}</h2>{extra}</div></div></div></div>'
+    )
+
+
+def top_card(name, headline, location, connections, followers=None):
+    counts = f'<li class="text-body-small">{escape(connections)}</li>'
+    if followers:
+        counts += f'<li class="text-body-small">{escape(followers)}</li>'
+    return (
+        '<section class="artdeco-card">'
+        '<div class="live-video-hero-image"><img src="/banner.jpg" alt=""></div>'
+        '<div class="ph5">'
+        '<div><img src="/photo.jpg" alt=""></div>'
+        '<div>'
+        f'<div><div><span><a href="/overlay/about-this-profile/"><h1>{escape(name)}</h1></a></span></div>'
+        f'<div class="text-body-medium">{escape(headline)}</div></div>'
+        f'<div><span class="text-body-small">{escape(location)}</span><span><a href="#">Contact info</a></span></div>'
+        '</div>'
+        f'<ul>{counts}</ul>'
+        '</div>'
+        '</section>'
+    )
+
+
+def about(summary):
+    return (
+        '<section class="artdeco-card">'
+        + heading("About")
+        + f'<div><div><div><div>{text(summary)}</div></div></div></div>'
+        '</section>'
+    )
+
+
+def activity(followers, last_post=None):
+    posts = ""
+    if last_post:
+        posts = (
+            '<div><div><div><div><div></div><div><section><div></div><div><div><ul><li>'
+            '<div><div><div><div><div><div><div><div><div><div>'
+            f'<span><span>Feed post</span><span>{escape(last_post)} • </span></span>'
+            '</div></div></div></div></div></div></div></div></div></div>'
+            '</li></ul></div></div></section></div></div></div></div></div>'
+        )
+    return (
+        '<section class="artdeco-card">'
+        + heading("Activity", f'<p>{text(followers)}</p>')
+        + '<div></div>'
+        + (posts or '<div><div><div><div><p>No recent posts</p></div></div></div></div>')
+        + '</section>'
+    )
+
+
+def entity_link(title, spans):
+    spans_html = "".join(f"<span>{text(value)}</span>" for value in spans)
+    return (
+        '<a class="optional-action-target-wrapper" href="#">'
+        f'<div><div><div><div>{text(title)}</div></div></div></div>'
+        f'{spans_html}'
+        '</a>'
+    )
+
+
+def single_role(title, company_line, tenure, location, company_url):
+    return (
+        '<li class="artdeco-list__item">'
+        '<div><div>'
+        f'<a href="{escape(company_url)}"><img src="/logo.png" alt=""></a>'
+        '</div><div>'
+        f'<div>{entity_link(title, [company_line, tenure, location])}</div>'
+        '<div><ul><li><div>Worked on the data platform.</div></li></ul></div>'
+        '</div></div>'
+        '</li>'
+    )
+
+
+def nested_company(company, summary, location, company_url, roles):
+    role_items = "".join(
+        '<li><span class="pvs-entity__path-node"></span>'
+        '<div><div></div><div>'
+        f'<div>{entity_link(role_title, spans)}</div>'
+        '</div></div></li>'
+        for role_title, spans in roles
+    )
+    return (
+        '<li class="artdeco-list__item">'
+        '<div><div>'
+        f'<a href="{escape(company_url)}"><img src="/logo.png" alt=""></a>'
+        '</div><div>'
+        f'<div>{entity_link(company, [summary, location])}</div>'
+        f'<div><ul>{role_items}</ul></div>'
+        '</div></div>'
+        '</li>'
+    )
+
+
+def experience(items):
+    return (
+        '<section class="artdeco-card">'
+        + heading("Experience")
+        + f'<div><ul>{"".join(items)}</ul></div>'
+        '</section>'
+    )
+
+
+def skill_item(name):
+    return (
+        '<li class="artdeco-list__item"><div><div></div><div>'
+        f'<div>{entity_link(name, [])}</div>'
+        '</div></div></li>'
+    )
+
+
+def skills(names):
+    items = "".join(skill_item(name) for name in names)
+    return (
+        '<section class="artdeco-card">'
+        + heading("Skills")
+        + f'<div><ul>{items}</ul></div>'
+        '</section>'
+    )
+
+
+def plain_section(title):
+    return (
+        '<section class="artdeco-card">'
+        + heading(title)
+        + f'<div><ul><li>{text(title + " entry")}</li></ul></div>'
+        '</section>'
+    )
+
+
+def details_page(title, items, page_size=DETAILS_PAGE_SIZE):
+    # /details/<section>/ page. FakeDriver shows page_size items at first and
+    # page_size more per scroll, like LinkedIn's lazy-loaded list.
+    return page(
+        '<section class="artdeco-card">'
+        f'<div><h2>{text(title)}</h2></div>'
+        '<div class="pvs-list__container"><div><div class="scaffold-finite-scroll__content">'
+        f'<ul data-page-size="{page_size}">{"".join(items)}</ul>'
+        '</div></div></div>'
+        '</section>'
+    )
+
+
+def page(*sections):
+    return (
+        '<!DOCTYPE html>\n<html lang="en"><head><meta charset="utf-8">'
+        '<title>LinkedIn</title><style>.visually-hidden{position:absolute}</style>'
+        '<script>window.__fixture = true;</script></head>'
+        '<body><header>LinkedIn</header><main>'
+        + "".join(sections)
+        + '</main></body></html>\n'
+    )
+
+
+SINGLE_ROLES = [
+    single_role("Senior Data Engineer", "Acme Analytics · Full-time", "Jan 2021 - Present · 3 yrs 9 mos",
+                "Pune, Maharashtra, India · Hybrid", "https://www.linkedin.com/company/acme/"),
+    single_role("Data Engineer", "Globex · Full-time", "Jun 2018 - Dec 2020 · 2 yrs 7 mos",
+                "Bengaluru, Karnataka, India · On-site", "https://www.linkedin.com/company/globex/"),
+    single_role("Intern", "Initech · Internship", "Jan 2018 - May 2018 · 5 mos",
+                "Remote", "https://www.linkedin.com/company/initech/"),
+]
+
+NESTED = nested_company(
+    "Umbrella Corp", "Full-time · 6 yrs 4 mos", "Mumbai, Maharashtra, India",
+    "https://www.linkedin.com/company/umbrella/",
+    [
+        ("Engineering Manager", ["Full-time", "Apr 2022 - Present · 2 yrs 6 mos", "Mumbai, Maharashtra, India · Hybrid"]),
+        ("Staff Engineer", ["Full-time", "Jan 2020 - Mar 2022 · 2 yrs 3 mos", "Mumbai, Maharashtra, India · On-site"]),
+        ("Senior Engineer", ["Full-time", "Jul 2018 - Dec 2019 · 1 yr 6 mos", "Mumbai, Maharashtra, India · On-site"]),
+    ]
+)
+
+SKILL_NAMES = [
+    "Python", "SQL", "Apache Spark", "Airflow", "Kafka", "Docker", "Kubernetes",
+    "AWS", "Terraform", "dbt", "Snowflake", "PostgreSQL", "MySQL", "Pandas",
+    "Data Modeling", "ETL", "Git", "Linux", "Scala", "Java", "Go", "Redis",
+    "Elasticsearch", "Tableau", "Power BI", "Machine Learning", "Statistics",
+    "Leadership", "Mentoring", "Agile", "Communication", "System Design",
+    "Microservices", "REST APIs", "GraphQL", "CI/CD", "Jenkins", "GitHub Actions",
+    "Prometheus", "Grafana", "BigQuery", "Hadoop", "Hive", "Flink", "Delta Lake",
+    "Databricks", "Azure", "GCP", "NoSQL", "MongoDB",
+]
+
+# Older roles and further skills only the details pages list.
+EXTRA_ROLES = [
+    single_role(f"Software Engineer {n}", "Hooli · Full-time", f"Jan {2008 + n} - Dec {2008 + n} · 1 yr",
+                "Chennai, Tamil Nadu, India · On-site", "https://www.linkedin.com/company/hooli/")
+    for n in range(1, 24)
+]
+EXTRA_SKILLS = [f"Skill {n}" for n in range(1, 31)]
+
+FIXTURES = {
+    "single_roles.html": page(
+        top_card("Asha Patil", "Senior Data Engineer at Acme Analytics", "Pune, Maharashtra, India",
+                 "500+ connections", "1,204 followers"),
+        about("I build reliable data platforms."),
+        activity("1,204 followers", "2w"),
+        experience(SINGLE_ROLES),
+        plain_section("Education"),
+        skills(SKILL_NAMES[:5]),
+        plain_section("Interests"),
+    ),
+    "nested_roles.html": page(
+        top_card("Ravi Kumar", "Engineering Manager at Umbrella Corp", "Mumbai, Maharashtra, India",
+                 "312 connections"),
+        about("Leading platform teams."),
+        activity("2,310 followers"),
+        experience([NESTED] + SINGLE_ROLES[1:]),
+        plain_section("Education"),
+        skills(SKILL_NAMES[:8]),
+        plain_section("Interests"),
+    ),
+    "no_about.html": page(
+        top_card("Meera Shah", "Student at Pune University", "Pune, Maharashtra, India",
+                 "87 connections", "90 followers"),
+        experience(SINGLE_ROLES[2:]),
+        plain_section("Education"),
+        skills(SKILL_NAMES[:3]),
+        plain_section("Interests"),
+    ),
+    "long_skills.html": page(
+        top_card("Karan Mehta", "Principal Engineer", "Hyderabad, Telangana, India",
+                 "500+ connections", "12K followers"),
+        about("Generalist engineer."),
+        activity("12K followers", "3d"),
+        experience([NESTED] + SINGLE_ROLES),
+        plain_section("Education"),
+        plain_section("Licenses & certifications"),
+        skills(SKILL_NAMES),
+        plain_section("Interests"),
+    ),
+}
+
+
+# Details pages per profile fixture, for deep mode: <fixture>_<page>.html.
+DETAILS_FIXTURES = {
+    "single_roles_experience.html": details_page("Experience", SINGLE_ROLES),
+    "single_roles_skills.html": details_page("Skills", [skill_item(name) for name in SKILL_NAMES[:5]]),
+    "nested_roles_experience.html": details_page("Experience", [NESTED] + SINGLE_ROLES[1:]),
+    "nested_roles_skills.html": details_page("Skills", [skill_item(name) for name in SKILL_NAMES[:8]]),
+    "no_about_experience.html": details_page("Experience", SINGLE_ROLES[2:]),
+    "no_about_skills.html": details_page("Skills", [skill_item(name) for name in SKILL_NAMES[:3]]),
+    "long_skills_experience.html": details_page("Experience", [NESTED] + SINGLE_ROLES + EXTRA_ROLES),
+    "long_skills_skills.html": details_page(
+        "Skills", [skill_item(name) for name in SKILL_NAMES + EXTRA_SKILLS]
+    ),
+}
+
+
+def main():
+    for directory, fixtures in ((FIXTURE_DIR, FIXTURES), (DETAILS_DIR, DETAILS_FIXTURES)):
+        os.makedirs(directory, exist_ok=True)
+        for name, html in fixtures.items():
+            with open(os.path.join(directory, name), "w", encoding="utf-8") as f:
+                f.write(html)
+            print(f"wrote {os.path.relpath(os.path.join(directory, name), FIXTURE_DIR)} ({len(html)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
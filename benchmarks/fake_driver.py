@@ -0,0 +1,145 @@
+from collections import Counter
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import lxml.html
+
+from snapshot import SnapshotDriver
+
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+PROFILE_URL = "https://www.linkedin.com/in/{name}/"
+DETAILS_URL = PROFILE_URL + "details/{page}/"
+
+
+# Counts every call that would be a round trip to chromedriver on a real
+# WebDriver (lookups, .text, attributes, navigation) and can add latency to each.
+class RoundTrips:
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.counts = Counter()
+
+    def hit(self, name):
+        self.counts[name] += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def total(self):
+        return sum(self.counts.values())
+
+    def reset(self):
+        self.counts.clear()
+
+
+class FakeElement:
+
+    def __init__(self, element, trips):
+        self._element = element
+        self._trips = trips
+
+    @property
+    def text(self):
+        self._trips.hit("text")
+        return self._element.text
+
+    def get_attribute(self, name):
+        self._trips.hit("get_attribute")
+        return self._element.get_attribute(name)
+
+    def find_element(self, by, value):
+        self._trips.hit("find_element")
+        return FakeElement(self._element.find_element(by, value), self._trips)
+
+    def find_elements(self, by, value):
+        self._trips.hit("find_elements")
+        return [FakeElement(e, self._trips) for e in self._element.find_elements(by, value)]
+
+
+# Serves saved profile pages through the subset of the WebDriver API the
+# scraper uses. pages maps profile URL -> HTML. A list marked data-page-size
+# (details pages) shows that many items, and that many more per scroll.
+class FakeDriver:
+
+    def __init__(self, pages, latency=0.0):
+        self.pages = pages
+        self.trips = RoundTrips(latency)
+        self._page = None
+        self._url = None
+        self._shown = None
+
+    @classmethod
+    def from_fixtures(cls, fixture_dir=FIXTURE_DIR, latency=0.0):
+        pages = {}
+        for filename in sorted(os.listdir(fixture_dir)):
+            if filename.endswith(".html"):
+                with open(os.path.join(fixture_dir, filename), encoding="utf-8") as f:
+                    pages[PROFILE_URL.format(name=filename[:-5])] = f.read()
+        details_dir = os.path.join(fixture_dir, "details")
+        for filename in sorted(os.listdir(details_dir)) if os.path.isdir(details_dir) else []:
+            if filename.endswith(".html"):
+                name, page = filename[:-5].rsplit("_", 1)
+                with open(os.path.join(details_dir, filename), encoding="utf-8") as f:
+                    pages[DETAILS_URL.format(name=name, page=page)] = f.read()
+        return cls(pages, latency)
+
+    def get(self, url):
+        self.trips.hit("get")
+        self._url = url
+        self._shown = 0
+        self._render()
+
+    def _render(self):
+        html = self.pages[self._url]
+        if "data-page-size" in html:
+            root = lxml.html.fromstring(html)
+            for ul in root.xpath("//ul[@data-page-size]"):
+                self._shown += int(ul.get("data-page-size"))
+                for item in ul.findall("li")[self._shown:]:
+                    ul.remove(item)
+            html = lxml.html.tostring(root, encoding="unicode")
+        self._page = SnapshotDriver(html, self._url)
+
+    def execute_script(self, script, *args):
+        # Any script counts as a scroll to the bottom.
+        self.trips.hit("execute_script")
+        if self._url is not None:
+            self._render()
+
+    def refresh(self):
+        self.trips.hit("refresh")
+
+    @property
+    def current_url(self):
+        self.trips.hit("current_url")
+        return self._page.current_url
+
+    @property
+    def page_source(self):
+        self.trips.hit("page_source")
+        return self._page.page_source
+
+    def find_element(self, by, value):
+        self.trips.hit("find_element")
+        return FakeElement(self._page.find_element(by, value), self.trips)
+
+    def find_elements(self, by, value):
+        self.trips.hit("find_elements")
+        return [FakeElement(e, self.trips) for e in self._page.find_elements(by, value)]
+
+    def get_cookie(self, name):
+        self.trips.hit("get_cookie")
+        return None
+
+    def get_cookies(self):
+        self.trips.hit("get_cookies")
+        return []
+
+    def add_cookie(self, cookie):
+        self.trips.hit("add_cookie")
+
+    def quit(self):
+        pass
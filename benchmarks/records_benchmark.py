@@ -0,0 +1,103 @@
+import argparse
+import gc
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Experience, Profile, to_arrow, to_columns, to_frame
+
+
+# Memory of a batch of scraped profiles held as the old nested dicts versus
+# records.Profile, and the cost of converting the batch to columns.
+#
+#   python benchmarks/records_benchmark.py --profiles 50000
+
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "Recruiter", "QA Engineer"]
+COMPANIES = ["Google", "Infosys", "Microsoft", "Amazon", "Wipro", "Accenture"]
+SKILLS = ["Python", "Java", "SQL", "Kubernetes", "React", "AWS", "Docker", "Excel", "Go"]
+
+
+def synthetic_profile(rng, n):
+    # Distinct strings per profile, as page text would be.
+    roles = [
+        Experience(
+            job_title=f"{rng.choice(TITLES)} {n}",
+            company_name=f"{rng.choice(COMPANIES)} {n}",
+            company_link=f"https://www.linkedin.com/company/{n}-{i}/",
+            location=f"Pune, Maharashtra, India {n}",
+            work_mode=rng.choice(["On-site", "Hybrid", "Remote", None]),
+            total_duration=None if i else f"{rng.randint(1, 9)} yrs {n % 12} mos",
+            job_type=rng.choice(["Full-time", "Contract", None]),
+            duration=f"{rng.randint(1, 5)} yrs {n % 12} mos",
+            tenurity=f"Jan {2010 + i} - Present {n}",
+        )
+        for i in range(rng.randint(1, 5))
+    ]
+    return Profile(
+        name=f"Person {n}",
+        connections=f"{rng.randint(1, 500)} connections",
+        followers=f"{rng.randint(1, 5000)} followers",
+        headline=f"{roles[0].job_title} at {roles[0].company_name}",
+        about=None if n % 3 else f"About person {n}",
+        last_activity=None if n % 2 else f"{n % 30}d",
+        location=f"Pune, Maharashtra, India {n}",
+        profile_url=f"https://www.linkedin.com/in/person-{n}/",
+        experience=roles,
+        skills=rng.sample(SKILLS, rng.randint(2, 8)),
+    )
+
+
+def legacy_dict(profile):
+    # The shape start_scrap() returned before records: nested dicts with
+    # "Not Found" for missing values.
+    data = profile.to_dict()
+    data["basic_info"] = {k: "Not Found" if v is None else v for k, v in data["basic_info"].items()}
+    data["experience"] = [
+        {k: "Not Found" if v is None else v for k, v in entry.items()} for entry in data["experience"]
+    ]
+    return data
+
+
+def measure(build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    batch = build()
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return batch, size, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark profile records against nested dicts.")
+    parser.add_argument("--profiles", type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    _, dict_bytes, _ = measure(lambda: [
+        legacy_dict(synthetic_profile(random.Random(n), n)) for n in range(args.profiles)
+    ])
+    profiles, record_bytes, _ = measure(lambda: [
+        synthetic_profile(random.Random(n), n) for n in range(args.profiles)
+    ])
+    print(f"{args.profiles} profiles as dicts:   {dict_bytes / 2**20:8.1f} MiB")
+    print(f"{args.profiles} profiles as records: {record_bytes / 2**20:8.1f} MiB "
+          f"({record_bytes / dict_bytes:.0%})")
+
+    print()
+    for name, convert in (("to_columns", to_columns), ("to_frame", to_frame), ("to_arrow", to_arrow)):
+        try:
+            started = time.perf_counter()
+            convert(profiles)
+        except ImportError as e:
+            print(f"{name:<12} skipped: {e}")
+            continue
+        print(f"{name:<12} {(time.perf_counter() - started) * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
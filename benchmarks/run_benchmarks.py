@@ -0,0 +1,159 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from fake_driver import PROFILE_URL, FakeDriver
+
+import scraper
+from snapshot import SnapshotDriver
+
+
+# Offline extraction benchmark: runs the scraper's parsing functions against the
+# saved fixtures through FakeDriver and reports time and driver round trips per
+# function, for live WebDriver parsing and for single-snapshot parsing.
+#
+#   python benchmarks/run_benchmarks.py --latency-ms 2 --repeat 5
+#   python benchmarks/run_benchmarks.py --deep     # details pages, scroll rounds
+
+
+def timed(driver, fn, *args):
+    before = driver.trips.total()
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started, driver.trips.total() - before
+
+
+def run_extraction(driver, url, mode):
+    stages = []
+    driver.get(url)
+
+    target = driver
+    if mode == "snapshot":
+        target, seconds, calls = timed(driver, SnapshotDriver.capture, driver)
+        stages.append(("capture", seconds, calls))
+
+    sections, seconds, calls = timed(driver, scraper.build_section_map, target)
+    stages.append(("build_section_map", seconds, calls))
+    for name, fn in (
+        ("get_basic_info", scraper.get_basic_info),
+        ("get_experience", scraper.get_experience),
+        ("get_skills", scraper.get_skills),
+    ):
+        _, seconds, calls = timed(driver, fn, target, sections)
+        stages.append((name, seconds, calls))
+    return stages
+
+
+def run_start_scrap(driver, url, mode):
+    _, seconds, calls = timed(driver, scraper.start_scrap, driver, url, mode == "snapshot")
+    return [("start_scrap", seconds, calls)]
+
+
+def benchmark(fixtures, modes, repeat, latency, with_waits):
+    driver = FakeDriver.from_fixtures(latency=latency)
+    run = run_start_scrap if with_waits else run_extraction
+    results = []
+
+    for fixture in fixtures:
+        url = PROFILE_URL.format(name=fixture)
+        for mode in modes:
+            samples = {}
+            for _ in range(repeat):
+                for name, seconds, calls in run(driver, url, mode):
+                    samples.setdefault(name, ([], calls))[0].append(seconds)
+            for name, (seconds, calls) in samples.items():
+                results.append({
+                    "fixture": fixture,
+                    "mode": mode,
+                    "function": name,
+                    "mean_ms": statistics.mean(seconds) * 1000,
+                    "min_ms": min(seconds) * 1000,
+                    "driver_calls": calls,
+                })
+    return results
+
+
+def deep_benchmark(fixtures, modes, latency, settle):
+    # One deep start_scrap per fixture and mode. Every details page costs at
+    # least one settle wait: the scroll that confirms the list is complete.
+    driver = FakeDriver.from_fixtures(latency=latency)
+    header = f"{'fixture':<14} {'mode':<9} {'page':<20} {'items':>6} {'scrolls':>8} {'ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for fixture in fixtures:
+        for mode in modes:
+            timings = {}
+            _, seconds, calls = timed(
+                driver, scraper.start_scrap, driver, PROFILE_URL.format(name=fixture),
+                mode == "snapshot", True, {"details_settle": settle}, timings
+            )
+            for page in ("details_experience", "details_skills"):
+                if page in timings:
+                    print(f"{fixture:<14} {mode:<9} {page:<20} {timings[page + '_items']:>6} "
+                          f"{timings[page + '_scrolls']:>8} {timings[page] * 1000:>9.1f}")
+            print(f"{fixture:<14} {mode:<9} {'start_scrap total':<20} {'':>6} {'':>8} "
+                  f"{seconds * 1000:>9.1f}  ({calls} calls)")
+
+
+def print_table(results):
+    header = f"{'fixture':<14} {'mode':<9} {'function':<18} {'mean ms':>9} {'min ms':>9} {'calls':>6}"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['fixture']:<14} {row['mode']:<9} {row['function']:<18} "
+            f"{row['mean_ms']:>9.2f} {row['min_ms']:>9.2f} {row['driver_calls']:>6}"
+        )
+
+    print()
+    totals = {}
+    for row in results:
+        key = (row["fixture"], row["mode"])
+        ms, calls = totals.get(key, (0, 0))
+        totals[key] = (ms + row["mean_ms"], calls + row["driver_calls"])
+    for (fixture, mode), (ms, calls) in totals.items():
+        print(f"{fixture:<14} {mode:<9} total {ms:>9.2f} ms {calls:>6} calls")
+
+
+def main(argv=None):
+    fixtures = sorted(
+        name[:-5] for name in os.listdir(os.path.join(os.path.dirname(__file__), "fixtures"))
+        if name.endswith(".html")
+    )
+    parser = argparse.ArgumentParser(description="Offline benchmark of profile extraction.")
+    parser.add_argument("--fixture", action="append", choices=fixtures,
+                        help="fixture to run (default: all)")
+    parser.add_argument("--mode", action="append", choices=["live", "snapshot"],
+                        help="parsing mode (default: both)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="simulated chromedriver latency per round trip")
+    parser.add_argument("--with-waits", action="store_true",
+                        help="time start_scrap end to end, including readiness waits")
+    parser.add_argument("--deep", action="store_true",
+                        help="run start_scrap in deep mode and report each details page")
+    parser.add_argument("--settle", type=float, default=0.5,
+                        help="seconds a scroll may take to add items in --deep (default %(default)s)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    if args.deep:
+        deep_benchmark(args.fixture or fixtures, args.mode or ["live", "snapshot"],
+                       args.latency_ms / 1000, args.settle)
+        return
+
+    results = benchmark(
+        args.fixture or fixtures, args.mode or ["live", "snapshot"],
+        args.repeat, args.latency_ms / 1000, args.with_waits
+    )
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
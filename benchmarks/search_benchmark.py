@@ -0,0 +1,98 @@
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import Experience, Profile
+from search_index import SearchIndex
+
+
+# Builds a search index of synthetic profiles and times queries against it.
+#
+#   python benchmarks/search_benchmark.py --profiles 200000
+
+FIRST_NAMES = ["Aarav", "Priya", "Rahul", "Sneha", "John", "Maria", "Wei", "Fatima", "Lukas", "Ana"]
+LAST_NAMES = ["Sharma", "Patel", "Smith", "Garcia", "Chen", "Khan", "Müller", "Silva", "Kumar", "Rossi"]
+TITLES = ["Software Engineer", "Data Scientist", "Product Manager", "DevOps Engineer",
+          "Machine Learning Engineer", "Frontend Developer", "Sales Manager", "Recruiter",
+          "Business Analyst", "QA Engineer"]
+COMPANIES = ["Google", "Infosys", "Tata Consultancy Services", "Microsoft", "Amazon", "Wipro",
+             "Accenture", "Flipkart", "Zomato", "Deloitte"]
+SKILLS = ["Python", "Java", "SQL", "Kubernetes", "React", "TensorFlow", "Excel", "AWS",
+          "Docker", "Leadership", "Negotiation", "Pandas", "Go", "Rust", "Selenium",
+          "Azure", "Spark", "Tableau", "Figma", "Salesforce", "SAP", "Kotlin", "Swift",
+          "Angular", "Django", "Flask", "Terraform", "Linux", "Hadoop", "PowerBI",
+          "Marketing", "Accounting", "Recruiting", "Copywriting", "SEO", "Photoshop",
+          "Communication", "Agile", "Scrum", "Jira"]
+CITIES = ["Pune", "Bengaluru", "Mumbai", "London", "Berlin", "Singapore", "New York", "Toronto"]
+
+# Filler vocabulary for the about text, so common words are not all skill names.
+SYLLABLES = ["ka", "lo", "mi", "ne", "ru", "sa", "ti", "vo", "ze", "pa", "do", "gu", "ha", "ji"]
+FILLER = [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+
+QUERIES = ["python", "data scientist", "google kubernetes", "pune", "priya sharma",
+           "machine learning tensorflow", "sel", "rust berlin", "recruiter infosys"]
+
+
+def synthetic_profile(rng, n):
+    roles = [
+        Experience(job_title=rng.choice(TITLES), company_name=rng.choice(COMPANIES))
+        for _ in range(rng.randint(1, 4))
+    ]
+    return Profile(
+        name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        headline=f"{roles[0].job_title} at {roles[0].company_name}",
+        location=f"{rng.choice(CITIES)}, Earth",
+        about=" ".join(rng.choices(FILLER, k=40) + rng.sample(SKILLS, 2)),
+        profile_url=f"https://www.linkedin.com/in/profile-{n}/",
+        experience=roles,
+        skills=rng.sample(SKILLS, rng.randint(3, 10)),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the profile search index.")
+    parser.add_argument("--profiles", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--index", help="reuse or keep this index file (default: a temp file)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SearchIndex(args.index or os.path.join(tmp, "search.sqlite3"))
+        missing = args.profiles - index.count()
+        if missing > 0:
+            rng = random.Random(42)
+            started = time.perf_counter()
+            start = index.count()
+            for offset in range(0, missing, 5000):
+                batch = range(start + offset, start + min(offset + 5000, missing))
+                index.add_many([synthetic_profile(rng, n) for n in batch])
+            index.optimize()
+            elapsed = time.perf_counter() - started
+            print(f"Indexed {missing} profiles in {elapsed:.1f}s ({missing / elapsed:,.0f}/s)\n")
+
+        # Ranking cost grows with the number of matching profiles, so it is shown.
+        header = f"{'query':<30} {'matches':>8} {'median ms':>10} {'max ms':>8}"
+        print(header)
+        print("-" * len(header))
+        for query in QUERIES:
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                index.search(query)
+                samples.append((time.perf_counter() - started) * 1000)
+            matches = index.match_count(query)
+            print(f"{query:<30} {matches:>8} {statistics.median(samples):>10.2f} {max(samples):>8.2f}")
+
+        started = time.perf_counter()
+        index.add(synthetic_profile(random.Random(), 0))
+        print(f"\nIncremental update of one profile: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
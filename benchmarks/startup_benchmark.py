@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+
+# Startup benchmark: every sample runs in a fresh interpreter, so imports are
+# measured cold. Reports time to import the application and time until the main
+# window is shown, plus which heavy modules were already loaded at that point
+# (they should only load on first export, write or browser launch).
+#
+#   python benchmarks/startup_benchmark.py --repeat 10 --budget-ms 800
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "pyarrow", "mysql.connector", "selenium.webdriver.remote.webdriver"]
+
+PROBE = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+SCENARIOS = {
+    # Everything app.py imports at startup apart from Qt (and result_model,
+    # which is Qt), so it runs anywhere.
+    "import_core": (
+        "import database, exporters, freshness, metrics, normalize, search_index, throttle, write_behind"
+    ),
+    "import_app": "import app",
+    # The browser launch itself runs on a background thread and is left out.
+    "first_window": "\n".join([
+        "from PyQt6.QtWidgets import QApplication",
+        "import app",
+        "app.LinkedInScraperUI.init_driver = lambda self: None",
+        "qt = QApplication([])",
+        "window = app.LinkedInScraperUI()",
+        "window.show()",
+        "qt.processEvents()",
+    ]),
+}
+
+NEEDS_QT = {"import_app", "first_window"}
+
+
+def has_qt():
+    result = subprocess.run(
+        [sys.executable, "-c", "import PyQt6.QtWidgets"], capture_output=True
+    )
+    return result.returncode == 0
+
+
+def run_probe(body, home):
+    # HOME points at a scratch directory so the window's save folders are not
+    # created on the real desktop.
+    env = dict(os.environ, HOME=home, USERPROFILE=home, QT_QPA_PLATFORM="offscreen")
+    script = PROBE.format(root=ROOT, body=body, heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, env=env, cwd=home
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def benchmark(scenarios, repeat):
+    results = []
+    with tempfile.TemporaryDirectory() as home:
+        for name in scenarios:
+            samples = [run_probe(SCENARIOS[name], home) for _ in range(repeat)]
+            seconds = [sample["seconds"] for sample in samples]
+            results.append({
+                "scenario": name,
+                "median_ms": statistics.median(seconds) * 1000,
+                "min_ms": min(seconds) * 1000,
+                "max_ms": max(seconds) * 1000,
+                "loaded": samples[-1]["loaded"],
+            })
+    return results
+
+
+def print_table(results):
+    header = f"{'scenario':<14} {'median ms':>10} {'min ms':>9} {'max ms':>9}  heavy modules loaded"
+    print(header)
+    print("-" * len(header))
+    for row in results:
+        print(
+            f"{row['scenario']:<14} {row['median_ms']:>10.1f} {row['min_ms']:>9.1f} "
+            f"{row['max_ms']:>9.1f}  {', '.join(row['loaded']) or '-'}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold startup benchmark.")
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS),
+                        help="scenario to run (default: all that can run here)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float,
+                        help="exit with status 1 if any median exceeds this")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args(argv)
+
+    scenarios = args.scenario or list(SCENARIOS)
+    if not has_qt():
+        skipped = [name for name in scenarios if name in NEEDS_QT]
+        if skipped:
+            print(f"PyQt6 is not installed, skipping: {', '.join(skipped)}\n")
+        scenarios = [name for name in scenarios if name not in NEEDS_QT]
+
+    results = benchmark(scenarios, args.repeat)
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.budget_ms is not None:
+        over = [row["scenario"] for row in results if row["median_ms"] > args.budget_ms]
+        if over:
+            print(f"\nOver the {args.budget_ms:g} ms budget: {', '.join(over)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
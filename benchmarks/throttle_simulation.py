@@ -0,0 +1,107 @@
+import argparse
+from collections import deque
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from throttle import RATE_LIMITED, AdaptiveThrottle
+
+
+# Runs the request throttle on simulated time against a simulated rate limit,
+# and compares sustained successful profiles per hour for fixed request rates
+# and for AdaptiveThrottle. Nothing sleeps for real, so a day runs in a second.
+#
+#   python benchmarks/throttle_simulation.py --hours 24 --limit-per-hour 90
+
+
+class SimulatedClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += max(0.0, seconds)
+
+
+# Serves a throttle page once more than limit loads arrive within window
+# seconds, and keeps serving it for penalty seconds. Loads made during the
+# penalty extend it, as real rate limiters tend to.
+class SimulatedSite:
+
+    def __init__(self, limit, window=3600, penalty=900):
+        self.limit = limit
+        self.window = window
+        self.penalty = penalty
+        self.recent = deque()
+        self.blocked_until = 0.0
+
+    def load(self, now):
+        while self.recent and self.recent[0] <= now - self.window:
+            self.recent.popleft()
+        if now < self.blocked_until:
+            self.blocked_until = now + self.penalty
+            return False
+        self.recent.append(now)
+        if len(self.recent) > self.limit:
+            self.blocked_until = now + self.penalty
+            return False
+        return True
+
+
+def run(throttle, clock, site, hours, load_seconds, adapt):
+    ok = throttled = 0
+    end = hours * 3600
+    while clock.now < end:
+        throttle.acquire()
+        if clock.now >= end:
+            break
+        loaded = site.load(clock.now)
+        clock.sleep(load_seconds)
+        if loaded:
+            ok += 1
+            if adapt:
+                throttle.success()
+        else:
+            throttled += 1
+            if adapt:
+                throttle.throttled(RATE_LIMITED)
+    return ok, throttled
+
+
+def simulate(strategy, rate, args):
+    clock = SimulatedClock()
+    site = SimulatedSite(args.limit_per_hour, penalty=args.penalty)
+    throttle = AdaptiveThrottle(rate, clock=clock, sleep=clock.sleep)
+    ok, throttled = run(throttle, clock, site, args.hours, args.load_seconds, strategy == "adaptive")
+    return ok, throttled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate throttling strategies on simulated time.")
+    parser.add_argument("--hours", type=float, default=24)
+    parser.add_argument("--limit-per-hour", type=int, default=90,
+                        help="hidden limit of the simulated site (default %(default)s)")
+    parser.add_argument("--penalty", type=float, default=900,
+                        help="seconds the site keeps throttling once tripped (default %(default)s)")
+    parser.add_argument("--load-seconds", type=float, default=6,
+                        help="time one profile takes to load and parse (default %(default)s)")
+    parser.add_argument("--max-rate", type=float, default=600,
+                        help="rate ceiling given to the adaptive throttle (default %(default)s)")
+    args = parser.parse_args(argv)
+
+    header = f"{'strategy':<10} {'rate/h':>7} {'ok':>7} {'throttled':>10} {'ok/hour':>9}"
+    print(header)
+    print("-" * len(header))
+    runs = [("fixed", rate) for rate in (60, 90, 120, 240, args.max_rate)]
+    runs.append(("adaptive", args.max_rate))
+    for strategy, rate in runs:
+        ok, throttled = simulate(strategy, rate, args)
+        print(f"{strategy:<10} {rate:>7.0f} {ok:>7} {throttled:>10} {ok / args.hours:>9.1f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+import os
+import sys
+
+from session import PROFILE_DIR, LoginRequiredError, ensure_session, profile_path
+
+
+# Lean mode: the scraper only reads the DOM, so skip downloading images, video,
+# audio and fonts, and return from driver.get() at DOMContentLoaded (the
+# readiness waits take over from there). Set LI_LEAN_BROWSER=0 to disable.
+LEAN_BROWSER = os.environ.get("LI_LEAN_BROWSER", "1") != "0"
+
+BLOCKED_URL_PATTERNS = [
+    # images
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.ico",
+    # media
+    "*.mp4", "*.webm", "*.m3u8", "*.ts", "*.mp3", "*.m4a",
+    # fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # LinkedIn's image and video CDNs
+    "*media.licdn.com/*", "*dms.licdn.com/*",
+]
+
+
+def build_options(headless=False, lean=LEAN_BROWSER, user_data_dir=None):
+    options = webdriver.ChromeOptions()
+    if user_data_dir:
+        # Persistent profile: cookies, local storage and cache survive restarts.
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    if lean:
+        options.page_load_strategy = "eager"
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+        })
+    return options
+
+
+def block_resources(driver, patterns=BLOCKED_URL_PATTERNS):
+    # Chrome-only: the DevTools protocol drops matching requests before they are sent.
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except WebDriverException as e:
+        print(f"[-] Could not block resources: {e}", file=sys.stderr)
+
+
+def create_driver(headless=False, lean=LEAN_BROWSER, slot=None, profile_dir=PROFILE_DIR,
+                  require_session=True):
+    # slot: the pool position this browser fills; it picks the profile directory.
+    # Raises LoginRequiredError, after closing the browser, when neither its
+    # profile nor the saved cookies are logged in, so the pool never hands out
+    # a browser that would only hit login walls. require_session=False returns
+    # it anyway, for the browser someone is about to log in with.
+    user_data_dir = profile_path(slot, profile_dir)
+    if user_data_dir:
+        os.makedirs(user_data_dir, exist_ok=True)
+    driver = webdriver.Chrome(options=build_options(headless, lean, user_data_dir))
+    if lean:
+        block_resources(driver)
+    # Leaves the browser on the feed; session.session_valid() then tells
+    # without another page load whether it is logged in.
+    if not ensure_session(driver) and require_session:
+        driver.quit()
+        raise LoginRequiredError("LinkedIn session is not logged in; log in again through app.py "
+                                 "or cli.py --show-browser")
+    return driver
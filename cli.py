@@ -0,0 +1,264 @@
+import argparse
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from datetime import timedelta
+from functools import partial
+
+from browser import create_driver
+from database import (
+    BULK_MAX_AGE,
+    BULK_MAX_ROWS,
+    BulkWriter,
+    get_last_captured,
+    prepare_profile_for_db
+)
+from driver_pool import POOL_SIZE, DriverPool, ScrapeScheduler
+from freshness import FRESHNESS_TTL, FreshnessCache
+from job_queue import DONE, FAILED, JOB_QUEUE_FILE, LEASE_SECONDS, PENDING, RUNNING, open_queue, worker_id
+from metrics import METRICS_FILE, REGISTRY
+from search_index import SearchIndex
+from session import LoginRequiredError, login_interactively, session_valid
+from throttle import BURST, RATE_PER_HOUR, SESSION_BUDGET, AdaptiveThrottle, BudgetExhaustedError
+
+
+HEARTBEAT_SECONDS = LEASE_SECONDS / 4
+METRICS_WRITE_SECONDS = 10
+
+
+# stdout carries nothing but result lines, so `cli.py urls.txt > out.jsonl`
+# is valid JSONL; progress and every module's diagnostics go to stderr.
+def log(msg):
+    print(f"[{time.strftime('%H:%M:%S')}] {msg}", file=sys.stderr, flush=True)
+
+
+def read_urls(source):
+    stream = sys.stdin if source == "-" else open(source, encoding="utf-8")
+    try:
+        for line in stream:
+            url = line.strip()
+            if url and not url.startswith("#"):
+                yield url
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Scrape LinkedIn profiles headlessly and stream the results as JSONL."
+    )
+    parser.add_argument("urls", nargs="?", default="-",
+                        help="file with one profile URL per line, or - for stdin (default); "
+                             "optional when resuming a queue")
+    parser.add_argument("-q", "--queue", default=JOB_QUEUE_FILE,
+                        help=f"SQLite job queue file (default {JOB_QUEUE_FILE}), or 'mysql' "
+                             "to work from the queue shared by all nodes (see coordinator.py)")
+    parser.add_argument("-o", "--output", default="-",
+                        help="JSONL file to append results to, or - for stdout (default)")
+    parser.add_argument("-w", "--workers", type=int, default=POOL_SIZE,
+                        help=f"number of parallel browsers (default {POOL_SIZE})")
+    parser.add_argument("--no-db", action="store_true",
+                        help="do not write results to the database")
+    parser.add_argument("--batch-size", type=int, default=BULK_MAX_ROWS,
+                        help=f"profiles per database flush (default {BULK_MAX_ROWS})")
+    parser.add_argument("--flush-interval", type=float, default=BULK_MAX_AGE,
+                        help=f"seconds before a partial batch is flushed (default {BULK_MAX_AGE})")
+    parser.add_argument("--force", action="store_true",
+                        help="scrape profiles even if they were captured recently")
+    parser.add_argument("--ttl-hours", type=float, default=FRESHNESS_TTL.total_seconds() / 3600,
+                        help="skip profiles captured within this many hours (default %(default)s)")
+    parser.add_argument("--rate-per-hour", type=float, default=RATE_PER_HOUR,
+                        help="page loads per hour when LinkedIn is not throttling (default %(default)s)")
+    parser.add_argument("--burst", type=int, default=BURST,
+                        help="loads that may go out back to back (default %(default)s)")
+    parser.add_argument("--budget", type=int, default=SESSION_BUDGET,
+                        help="stop after this many page loads, 0 for no limit (default %(default)s)")
+    parser.add_argument("--no-snapshot", action="store_true",
+                        help="parse through live WebDriver calls instead of one page snapshot")
+    parser.add_argument("--deep", action="store_true",
+                        help="read all roles and skills from the details pages "
+                             "(two more page loads per profile, paced and counted like the first)")
+    parser.add_argument("--metrics-file", default=METRICS_FILE,
+                        help=f"Prometheus text file with stage timings and counters (default {METRICS_FILE})")
+    parser.add_argument("--metrics-port", type=int,
+                        help="also serve the metrics over HTTP on this port at /metrics")
+    parser.add_argument("--search-index", metavar="FILE",
+                        help="also add every result to this local full-text search index")
+    parser.add_argument("--show-browser", action="store_true",
+                        help="run the browsers with a visible window, and log in there if needed")
+    parser.add_argument("--full-browser", action="store_true",
+                        help="load images, media and fonts instead of the lean browser profile")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Every run works through the persistent queue, so an interrupted run picks
+    # up where it stopped when started again with the same --queue file.
+    jobs = open_queue(args.queue)
+    recovered = jobs.recover()
+    if recovered:
+        log(f"Recovered {recovered} jobs from a previous run")
+    if args.urls != "-" or not sys.stdin.isatty():
+        added = jobs.enqueue(read_urls(args.urls))
+        log(f"Queued {added} new profile URLs")
+
+    counts = jobs.counts()
+    if not counts[PENDING] and not counts[RUNNING]:
+        log("Nothing to scrape.")
+        return 0
+
+    if args.metrics_port:
+        REGISTRY.serve(args.metrics_port)
+        log(f"Serving metrics on :{args.metrics_port}/metrics")
+
+    factory = partial(create_driver, headless=not args.show_browser, lean=not args.full_browser)
+    pool = DriverPool(factory, size=args.workers)
+    # The first browser proves the session (browser profile or saved cookies)
+    # before any job is claimed; the others start from what it saved, and a
+    # browser that still starts logged out fails with LoginRequiredError.
+    driver = pool.acquire(require_session=False)
+    logged_in = session_valid(driver)
+    if not logged_in and args.show_browser:
+        try:
+            login_interactively(driver)
+            logged_in = True
+        except LoginRequiredError as e:
+            log(str(e))
+    pool.release(driver)
+    if not logged_in:
+        log("Not logged in to LinkedIn. Log in once with --show-browser or through app.py.")
+        pool.close()
+        return 2
+
+    owner = worker_id()
+    out = sys.stdout if args.output == "-" else open(args.output, "a", encoding="utf-8")
+    freshness = FreshnessCache(
+        ttl=timedelta(hours=args.ttl_hours),
+        lookup=None if args.no_db else get_last_captured
+    )
+    throttle = AdaptiveThrottle(args.rate_per_hour, burst=args.burst, budget=args.budget)
+    scheduler = ScrapeScheduler(
+        pool, freshness=freshness, throttle=throttle, snapshot=not args.no_snapshot, deep=args.deep
+    )
+    failures = 0
+
+    def saved(urls):
+        jobs.complete(urls)
+        for url in urls:
+            freshness.mark(url)
+
+    def write_failed(url, error):
+        nonlocal failures
+        failures += 1
+        jobs.fail(url, error)
+        log(f"{url} not saved: {error}")
+
+    # With a database, a job only counts as done once its row is committed,
+    # and fails on its own if its row cannot be written.
+    writer = None if args.no_db else BulkWriter(
+        args.batch_size, args.flush_interval, on_flush=saved, on_failure=write_failed
+    )
+    search_index = SearchIndex(args.search_index) if args.search_index else None
+
+    skipped = 0
+    done = 0
+    # Set when no more jobs can start this run: budget used up or logged out.
+    stop_claiming = False
+    started = time.perf_counter()
+    last_heartbeat = last_metrics = time.monotonic()
+    log(f"Scraping {counts[PENDING] + counts[RUNNING]} profiles with {args.workers} browsers")
+    futures = {}
+    try:
+        while True:
+            # Claim only what the browsers can start soon; the rest stays pending
+            # in the queue for this or another run.
+            room = 0 if stop_claiming else args.workers * 2 - len(futures)
+            for url in jobs.claim(owner, limit=room) if room > 0 else []:
+                timings = {}
+                futures[scheduler.submit(url, force=args.force, timings=timings)] = (url, timings)
+            if not futures:
+                break
+
+            finished, _ = wait(futures, timeout=HEARTBEAT_SECONDS, return_when=FIRST_COMPLETED)
+            if time.monotonic() - last_heartbeat >= HEARTBEAT_SECONDS:
+                jobs.heartbeat(owner)
+                last_heartbeat = time.monotonic()
+            if time.monotonic() - last_metrics >= METRICS_WRITE_SECONDS:
+                REGISTRY.write(args.metrics_file)
+                last_metrics = time.monotonic()
+
+            for future in finished:
+                url, timings = futures.pop(future)
+                done += 1
+                try:
+                    profile = future.result()
+                    if profile is None:
+                        skipped += 1
+                        jobs.complete([url])
+                        log(f"[{done}] {url} skipped, captured recently")
+                        continue
+                    out.write(profile.to_json() + "\n")
+                    out.flush()
+                    if search_index:
+                        search_index.add(profile)
+                    if writer:
+                        writer.add(prepare_profile_for_db(profile), token=url)
+                    else:
+                        saved([url])
+                    status = "ok"
+                except BudgetExhaustedError as e:
+                    # Back to pending without using up an attempt.
+                    stop_claiming = True
+                    jobs.release([url])
+                    status = f"not started: {e}"
+                except LoginRequiredError as e:
+                    # A new browser came up logged out: every job after this
+                    # one would too. Released like the budget case.
+                    if not stop_claiming:
+                        failures += 1
+                    stop_claiming = True
+                    jobs.release([url])
+                    status = f"not started: {e}"
+                except Exception as e:
+                    failures += 1
+                    jobs.fail(url, e)
+                    status = f"error: {e}"
+
+                details = "".join(
+                    f", {page.removeprefix('details_')} page {timings[page]:.2f}s "
+                    f"in {timings[page + '_scrolls']} scrolls"
+                    for page in ("details_experience", "details_skills") if page in timings
+                )
+                log(
+                    f"[{done}] {url} {status} "
+                    f"(scrape {timings.get('scrape', 0):.2f}s, wait {timings.get('lease', 0):.2f}s{details})"
+                )
+    except KeyboardInterrupt:
+        log("Interrupted, stopping browsers... (run again to resume)")
+        failures += 1
+    finally:
+        # Jobs still waiting for a browser never started; hand them back.
+        jobs.release([url for future, (url, _) in futures.items() if future.cancel()])
+        scheduler.shutdown(wait=False)
+        if out is not sys.stdout:
+            out.close()
+        if writer:
+            writer.close()
+
+    REGISTRY.write(args.metrics_file)
+    if search_index:
+        search_index.optimize()
+    elapsed = time.perf_counter() - started
+    counts = jobs.counts()
+    log(
+        f"Finished in {elapsed:.1f}s, {skipped} skipped, {failures} failed; "
+        f"queue: {counts[DONE]} done, {counts[PENDING]} pending, {counts[FAILED]} failed"
+    )
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+import argparse
+import sys
+import time
+
+from cli import read_urls
+from job_queue import DONE, FAILED, PENDING, RUNNING, SHARED_QUEUE, open_queue
+
+
+# Coordinator side of a multi-node run. URLs go into the shared queue once;
+# every node then runs `python cli.py --queue mysql`, leases batches from it,
+# heartbeats its leases and writes into the same li_person_master tables.
+# Work held by a node that stops heartbeating is reclaimed when its lease
+# expires, so nodes can be added or killed at any time.
+#
+#   python coordinator.py enqueue urls.txt
+#   python coordinator.py watch            # status + reclaim every 30s
+#
+# -q/--queue takes a SQLite file instead, to try the setup on one machine.
+
+WATCH_INTERVAL = 30
+
+
+def print_status(jobs):
+    counts = jobs.counts()
+    total = sum(counts.values())
+    print(
+        f"[{time.strftime('%H:%M:%S')}] {total} jobs: {counts[PENDING]} pending, "
+        f"{counts[RUNNING]} running, {counts[DONE]} done, {counts[FAILED]} failed; "
+        f"{jobs.throughput(60)} done in the last hour"
+    )
+    for owner, (held, expires) in sorted(jobs.nodes().items()):
+        state = f"lease expires in {expires}s" if expires >= 0 else f"lease expired {-expires}s ago"
+        print(f"    {owner:<40} {held:>4} jobs, {state}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Feed and watch the job queue shared by scraper nodes.")
+    parser.add_argument("-q", "--queue", default=SHARED_QUEUE,
+                        help="'mysql' for the shared queue (default) or a SQLite queue file")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="add profile URLs to the queue")
+    enqueue.add_argument("urls", nargs="?", default="-",
+                         help="file with one profile URL per line, or - for stdin (default)")
+    commands.add_parser("status", help="show queue counts and live leases per node")
+    watch = commands.add_parser("watch", help="show status and reclaim expired leases periodically")
+    watch.add_argument("--interval", type=float, default=WATCH_INTERVAL)
+    commands.add_parser("reclaim", help="requeue jobs whose lease has expired")
+    commands.add_parser("retry-failed", help="give failed jobs a fresh set of attempts")
+    args = parser.parse_args(argv)
+
+    jobs = open_queue(args.queue)
+    if args.command == "enqueue":
+        print(f"Queued {jobs.enqueue(read_urls(args.urls))} new profile URLs")
+        print_status(jobs)
+    elif args.command == "status":
+        print_status(jobs)
+    elif args.command == "reclaim":
+        print(f"Reclaimed {jobs.reclaim_expired()} expired jobs")
+    elif args.command == "retry-failed":
+        print(f"Requeued {jobs.retry_failed()} failed jobs")
+    elif args.command == "watch":
+        try:
+            while True:
+                reclaimed = jobs.reclaim_expired()
+                if reclaimed:
+                    print(f"Reclaimed {reclaimed} jobs from nodes that stopped heartbeating")
+                print_status(jobs)
+                time.sleep(args.interval)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
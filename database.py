@@ -1,59 +1,141 @@
-import mysql.connector
 import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
 
-def get_connection():
-    return mysql.connector.connect(
-        host='localhost',
-        user='root',
-        password='',
-        database='linkedin_db'
-    )
-    
-
-def prepare_profile_for_db(raw):
-    basic = raw.get("basic_info", {})
-    exp = raw.get("experience", [])
-    first_exp = exp[0] if exp else {}
-
-    return {
-        "profile_link": raw.get("profile_link", ""),
-
-        "name": basic.get("name", ""),
-        "headline": basic.get("head_line", ""),
-        "location": basic.get("location", ""),
-        "connections": basic.get("connections", ""),
-        "last_activity": basic.get("last_activity", ""),
-        "profile_url": basic.get("profile_url", ""),
-        
-        "job_title": first_exp.get("job_title", ""),
-        "company_name": first_exp.get("company_name", ""),
-        "company_link": first_exp.get("company_link", ""),
-        "work_mode": first_exp.get("work_mode", ""),
-        "total_duration": first_exp.get("total_duration", ""),
-        "job_type": first_exp.get("job_type", ""),
-        "duration": first_exp.get("duration", ""),
-        "tenurity": first_exp.get("tenurity", ""),
-
-        "skills": ", ".join(raw.get("skills", [])),
-        "experience_json": exp
+from metrics import inc, span
+from normalize import (
+    FINGERPRINT_SECTIONS,
+    canonical_profile_url,
+    changed_sections,
+    normalize_batch,
+    profile_key,
+    section_fingerprints
+)
+from records import as_profile, flat_row
+
+
+DB_CONFIG = {
+    "host": "localhost",
+    "user": "root",
+    "password": "",
+    "database": "linkedin_db",
+}
+DB_POOL_SIZE = int(os.environ.get("LI_DB_POOL_SIZE", 5))
+# Seconds to wait for a free pooled connection before giving up.
+DB_POOL_TIMEOUT = 10
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # The connector is imported on first use so the GUI starts without it.
+    from mysql.connector import pooling
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name="linkedin_db",
+                pool_size=DB_POOL_SIZE,
+                pool_reset_session=True,
+                **DB_CONFIG
+            )
+    return _pool
+
+
+def get_connection(timeout=DB_POOL_TIMEOUT):
+    # Pooled connections go back to the pool on close() instead of disconnecting.
+    from mysql.connector import errors
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = get_pool().get_connection()
+            break
+        except errors.PoolError:
+            if time.monotonic() >= deadline:
+                inc("failures_total", stage="db_pool")
+                raise
+            time.sleep(0.05)
+
+    try:
+        # Health check; reconnects if the server dropped the connection while idle.
+        conn.ping(reconnect=True, attempts=3, delay=1)
+    except errors.Error:
+        try:
+            # The pool's session reset can fail on a dead connection too; the
+            # ping error is the one worth reporting.
+            conn.close()
+        except errors.Error:
+            pass
+        raise
+    return conn
+
+
+_last_task_ms = 0
+_task_id_lock = threading.Lock()
+
+
+def generate_task_id(prefix="LI_PERSON"):
+    # Millisecond timestamps, bumped forward when several ids are requested in
+    # the same millisecond so parallel and batched writes never collide.
+    global _last_task_ms
+    with _task_id_lock:
+        ms = max(int(time.time() * 1000), _last_task_ms + 1)
+        _last_task_ms = ms
+    now = datetime.fromtimestamp(ms / 1000)
+    return f"{prefix}_{now.strftime('%Y%m%d%H%M%S')}{ms % 1000:03d}"
+
+
+def prepare_profile_for_db(profile):
+    with span("prepare_profile_for_db"):
+        return _prepare_profile(as_profile(profile))
+
+
+def _prepare_profile(profile):
+    # The text columns of li_person are NOT NULL; a missing value is stored as "".
+    prepared = {
+        field: "" if value is None else value
+        for field, value in flat_row(profile).items()
     }
+    prepared.update({
+        "profile_url": canonical_profile_url(profile.profile_url or ""),
+        "profile_key": profile_key(profile.profile_url or ""),
+        "skill_list": list(profile.skills),
+        "experience_json": [entry.to_dict() for entry in profile.experience],
+        "fingerprints": section_fingerprints(profile)
+    })
+    return prepared
 
 
 
-def insert_li_person(profile,task_id):
-    conn = get_connection()
-    cursor = conn.cursor()
+PERSON_COLUMNS = [
+    "task_id", "profile_key", "name", "headline", "location", "connections", "last_activity",
+    "profile_url", "job_title", "company_name", "company_link", "work_mode", "total_duration",
+    "job_type", "duration", "tenurity", "skills", "experience_json",
+    "connections_count", "followers_count", "start_date", "end_date",
+    "is_current", "duration_months", "total_duration_months",
+    "fingerprint_basic", "fingerprint_experience", "fingerprint_skills", "changed_sections"
+]
 
-    sql = """
-    INSERT INTO li_person (
-        task_id, name, headline, location, connections, last_activity,
-        profile_url, job_title, company_name, company_link, work_mode, total_duration,
-        job_type, duration, tenurity, skills, experience_json
-    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-    """
+MASTER_UPSERT_CLAUSE = """
+    ON DUPLICATE KEY UPDATE
+        """ + ",\n        ".join(
+    f"{column}=VALUES({column})" for column in PERSON_COLUMNS
+) + """,
+        updated_at = CURRENT_TIMESTAMP,
+        last_seen_at = CURRENT_TIMESTAMP
+"""
 
-    cursor.execute(sql, (
+
+def person_row(profile, task_id):
+    return (
         task_id,
+        profile["profile_key"],
         profile["name"],
         profile["headline"],
         profile["location"],
@@ -69,66 +151,355 @@ def insert_li_person(profile,task_id):
         profile["duration"],
         profile["tenurity"],
         profile["skills"],
-        json.dumps(profile["experience_json"], ensure_ascii=False)
-    ))
+        json.dumps(profile["experience_json"], ensure_ascii=False),
+        profile["connections_count"],
+        profile["followers_count"],
+        profile["start_date"],
+        profile["end_date"],
+        profile["is_current"],
+        profile["duration_months"],
+        profile["total_duration_months"],
+        profile["fingerprints"]["basic"],
+        profile["fingerprints"]["experience"],
+        profile["fingerprints"]["skills"],
+        # MySQL SET column: the sections that differ from the previous capture.
+        ",".join(profile.get("changed_sections", FINGERPRINT_SECTIONS))
+    )
+
+
+# Rows per multi-row INSERT; keeps each statement well under max_allowed_packet.
+BULK_STATEMENT_ROWS = 200
+
+
+def insert_sql(table, row_count=1, columns=PERSON_COLUMNS, verb="INSERT"):
+    placeholders = "(" + ",".join(["%s"] * len(columns)) + ")"
+    return (
+        f"{verb} INTO {table} ({', '.join(columns)}) VALUES "
+        + ",".join([placeholders] * row_count)
+    )
+
+
+# li_experience holds one row per role and li_skill one row per skill, keyed by
+# profile_key. They mirror the latest capture in li_person_master: a write
+# replaces a profile's rows for each section that changed.
+EXPERIENCE_COLUMNS = [
+    "profile_key", "position", "task_id", "job_title", "company_name", "company_link",
+    "location", "work_mode", "job_type", "total_duration", "duration", "tenurity",
+    "start_date", "end_date", "is_current", "duration_months"
+]
+SKILL_COLUMNS = ["profile_key", "position", "task_id", "skill"]
+
+
+def experience_rows(profile, task_id):
+    return [
+        (
+            profile["profile_key"],
+            position,
+            task_id,
+            experience.get("job_title") or "",
+            experience.get("company_name") or "",
+            experience.get("company_link") or "",
+            experience.get("location") or "",
+            experience.get("work_mode") or "",
+            experience.get("job_type") or "",
+            experience.get("total_duration") or "",
+            experience.get("duration") or "",
+            experience.get("tenurity") or "",
+            experience.get("start_date"),
+            experience.get("end_date"),
+            experience.get("is_current"),
+            experience.get("duration_months")
+        )
+        for position, experience in enumerate(profile["experience_json"])
+    ]
+
+
+def skill_rows(profile, task_id):
+    return [
+        (profile["profile_key"], position, task_id, skill)
+        for position, skill in enumerate(profile["skill_list"])
+        if skill
+    ]
+
+
+# fingerprint section -> (table, columns, row builder)
+DETAIL_TABLES = {
+    "experience": ("li_experience", EXPERIENCE_COLUMNS, experience_rows),
+    "skills": ("li_skill", SKILL_COLUMNS, skill_rows),
+}
+
+
+def replace_details(cursor, profiles, sections=tuple(DETAIL_TABLES)):
+    # profiles: list of (normalized profile, task_id). When a profile appears
+    # more than once, its last capture wins.
+    latest = {profile["profile_key"]: (profile, task_id) for profile, task_id in profiles}
+    if not latest:
+        return
+
+    keys = list(latest)
+    for section in sections:
+        table, columns, build = DETAIL_TABLES[section]
+        for start in range(0, len(keys), BULK_STATEMENT_ROWS):
+            chunk = keys[start:start + BULK_STATEMENT_ROWS]
+            cursor.execute(
+                f"DELETE FROM {table} WHERE profile_key IN ({','.join(['%s'] * len(chunk))})", chunk
+            )
+
+        rows = [row for profile, task_id in latest.values() for row in build(profile, task_id)]
+        # INSERT IGNORE for skills: the same skill listed twice keeps its first position.
+        verb = "INSERT IGNORE" if table == "li_skill" else "INSERT"
+        for start in range(0, len(rows), BULK_STATEMENT_ROWS):
+            chunk = rows[start:start + BULK_STATEMENT_ROWS]
+            cursor.execute(
+                insert_sql(table, len(chunk), columns, verb),
+                [value for row in chunk for value in row]
+            )
+
+
+# Profile writes run at READ COMMITTED: the FOR UPDATE in stored_fingerprints
+# then locks only rows that exist. Under REPEATABLE READ it also gap-locked the
+# keys of profiles not stored yet, and two nodes inserting new profiles into
+# the same gap deadlocked. Two nodes saving the same new profile both find no
+# row and both upsert; the second upsert updates the first one's row.
+WRITE_ISOLATION = "READ COMMITTED"
+
+
+def stored_fingerprints(cursor, keys):
+    # profile_key -> fingerprints of its stored capture. Stored rows stay
+    # locked until commit, so two nodes saving the same profile do not
+    # interleave.
+    stored = {}
+    for start in range(0, len(keys), BULK_STATEMENT_ROWS):
+        chunk = keys[start:start + BULK_STATEMENT_ROWS]
+        cursor.execute(
+            "SELECT profile_key, fingerprint_basic, fingerprint_experience, fingerprint_skills "
+            f"FROM li_person_master WHERE profile_key IN ({','.join(['%s'] * len(chunk))}) FOR UPDATE",
+            chunk
+        )
+        for key, *fingerprints in cursor.fetchall():
+            stored[key] = dict(zip(FINGERPRINT_SECTIONS, fingerprints))
+    return stored
+
 
-    conn.commit()
-    cursor.close()
-    conn.close()
-    
+def touch_seen(cursor, profiles):
+    # Unchanged profiles: only last_seen_at and the relative last_activity move.
+    for start in range(0, len(profiles), BULK_STATEMENT_ROWS):
+        chunk = profiles[start:start + BULK_STATEMENT_ROWS]
+        cursor.execute(
+            "UPDATE li_person_master SET last_seen_at = CURRENT_TIMESTAMP, last_activity = CASE profile_key "
+            + " ".join(["WHEN %s THEN %s"] * len(chunk))
+            + f" ELSE last_activity END WHERE profile_key IN ({','.join(['%s'] * len(chunk))})",
+            [value for profile in chunk for value in (profile["profile_key"], profile["last_activity"])]
+            + [profile["profile_key"] for profile in chunk]
+        )
 
-def upsert_li_person_master(profile,task_id):
+
+def write_changes(cursor, profiles, history=True):
+    # profiles: list of (normalized profile, task_id), one per profile_key.
+    # Compares each with its stored fingerprints: unchanged profiles are only
+    # touched, changed and new ones get a history row (when history is on), a
+    # full master upsert, and new detail rows for the sections that changed.
+    stored = stored_fingerprints(cursor, [profile["profile_key"] for profile, _ in profiles])
+    changed, unchanged = [], []
+    for profile, task_id in profiles:
+        sections = changed_sections(profile["fingerprints"], stored.get(profile["profile_key"]))
+        if sections:
+            profile["changed_sections"] = sections
+            changed.append((profile, task_id))
+        else:
+            unchanged.append(profile)
+
+    touch_seen(cursor, unchanged)
+
+    rows = [person_row(profile, task_id) for profile, task_id in changed]
+    for start in range(0, len(rows), BULK_STATEMENT_ROWS):
+        chunk = rows[start:start + BULK_STATEMENT_ROWS]
+        params = [value for row in chunk for value in row]
+        if history:
+            cursor.execute(insert_sql("li_person", len(chunk)), params)
+        cursor.execute(insert_sql("li_person_master", len(chunk)) + MASTER_UPSERT_CLAUSE, params)
+
+    for section in DETAIL_TABLES:
+        replace_details(
+            cursor,
+            [(profile, task_id) for profile, task_id in changed if section in profile["changed_sections"]],
+            sections=(section,)
+        )
+
+    new = sum(1 for profile, _ in changed if profile["profile_key"] not in stored)
+    inc("profile_changes_total", new, status="new")
+    inc("profile_changes_total", len(changed) - new, status="changed")
+    inc("profile_changes_total", len(unchanged), status="unchanged")
+    return len(changed), len(unchanged)
+
+
+def get_last_captured(profile_url):
+    # Primary key lookup on li_person_master. last_seen_at moves on every
+    # capture, updated_at only when the profile changed.
     conn = get_connection()
-    cursor = conn.cursor()
-
-    sql = """
-    INSERT INTO li_person_master (
-        task_id, name, headline, location, connections, last_activity,
-        profile_url, job_title, company_name, company_link, work_mode, total_duration,
-        job_type, duration, tenurity, skills, experience_json
-    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-    ON DUPLICATE KEY UPDATE
-        task_id=VALUES(task_id),
-        name=VALUES(name),
-        headline=VALUES(headline),
-        location=VALUES(location),
-        connections=VALUES(connections),
-        last_activity=VALUES(last_activity),
-        profile_url=VALUES(profile_url),
-        company_name=VALUES(company_name),
-        company_link=VALUES(company_link),
-        work_mode=VALUES(work_mode),
-        total_duration=VALUES(total_duration),
-        job_type=VALUES(job_type),
-        duration=VALUES(duration),
-        tenurity=VALUES(tenurity),
-        skills=VALUES(skills),
-        experience_json=VALUES(experience_json),
-        updated_at = CURRENT_TIMESTAMP
-    """
-
-    cursor.execute(sql, (
-        task_id,
-        profile["name"],
-        profile["headline"],
-        profile["location"],
-        profile["connections"],
-        profile["last_activity"],
-        profile["profile_url"],
-        profile["job_title"],
-        profile["company_name"],
-        profile["company_link"],
-        profile["work_mode"],
-        profile["total_duration"],
-        profile["job_type"],
-        profile["duration"],
-        profile["tenurity"],
-        profile["skills"],
-        json.dumps(profile["experience_json"], ensure_ascii=False)
-    ))
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "SELECT COALESCE(last_seen_at, updated_at, inserted_at) FROM li_person_master "
+            "WHERE profile_key = %s",
+            (profile_key(profile_url),)
+        )
+        row = cursor.fetchone()
+        cursor.close()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+BULK_MAX_ROWS = int(os.environ.get("LI_BULK_MAX_ROWS", 250))
+BULK_MAX_AGE = float(os.environ.get("LI_BULK_MAX_AGE", 5))
+# Flushes a row may fail before it is reported through on_failure.
+BULK_ROW_ATTEMPTS = int(os.environ.get("LI_BULK_ROW_ATTEMPTS", 5))
+
+
+def write_profiles(batch):
+    # batch: list of (prepared profile, task_id). All tables are written in a
+    # single transaction, so a profile is never in one table without the others.
+    # Profiles whose fingerprints match the stored capture are only touched.
+    if not batch:
+        return 0
+
+    profiles = normalize_batch([profile for profile, _ in batch])
+    # A profile captured twice in one batch: its last capture wins.
+    latest = {
+        profile["profile_key"]: (profile, task_id)
+        for profile, (_, task_id) in zip(profiles, batch)
+    }
+
+    conn = get_connection()
+    try:
+        conn.start_transaction(isolation_level=WRITE_ISOLATION)
+        cursor = conn.cursor()
+        with span("db_write_profiles"):
+            write_changes(cursor, list(latest.values()))
+            conn.commit()
+        cursor.close()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return len(batch)
+
+
+def _is_connection_error(e):
+    # Errors that say nothing about the rows themselves: splitting the batch
+    # would only repeat them once per row.
+    from mysql.connector import errors
+    return isinstance(e, (ImportError, errors.InterfaceError, errors.OperationalError, errors.PoolError))
+
+
+class BulkWriter:
+    # Collects prepared profiles and flushes them with write_profiles once
+    # max_rows are pending or the oldest pending row is max_age seconds old.
+    #
+    # A batch that fails is split in halves until the rows that fail on their
+    # own are isolated; the rest of the batch is committed. Failed rows are
+    # retried on later timed flushes and given up after max_attempts, so one
+    # bad row never holds up the others, and flush() does not raise into
+    # whoever called add().
+
+    def __init__(self, max_rows=BULK_MAX_ROWS, max_age=BULK_MAX_AGE, on_flush=None,
+                 on_failure=None, max_attempts=BULK_ROW_ATTEMPTS):
+        self.max_rows = max_rows
+        self.max_age = max_age
+        # Called with the tokens passed to add() once their rows are committed.
+        self.on_flush = on_flush
+        # Called with (token, error) for a row given up after max_attempts.
+        self.on_failure = on_failure
+        self.max_attempts = max_attempts
+        self.last_error = None
+
+        # (profile, task_id, token, failed attempts)
+        self._pending = []
+        self._retrying = 0
+        self._oldest = None
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._timer = threading.Thread(target=self._flush_when_due, daemon=True)
+        self._timer.start()
+
+    def add(self, profile, task_id=None, token=None):
+        with self._lock:
+            self._pending.append((profile, task_id or generate_task_id(), token, 0))
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            # Rows waiting for a retry wait for the timer, not for new rows.
+            full = len(self._pending) - self._retrying >= self.max_rows
+        if full:
+            self.flush()
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                self._retrying = 0
+                self._oldest = None
+
+            retry, failed = [], []
+            written = self._write(batch, retry, failed)
+            if retry:
+                inc("retries_total", len(retry), kind="bulk_flush")
+                print(f"[-] Bulk write failed for {len(retry)} rows, will retry: {self.last_error}",
+                      file=sys.stderr)
+                with self._lock:
+                    self._pending = retry + self._pending
+                    self._retrying = len(retry)
+                    if self._oldest is None:
+                        self._oldest = time.monotonic()
+            self._give_up(failed)
+            return written
+
+    def _write(self, rows, retry, failed):
+        if not rows:
+            return 0
+        try:
+            written = write_profiles([(profile, task_id) for profile, task_id, _, _ in rows])
+        except Exception as e:
+            self.last_error = e
+            if len(rows) > 1 and not _is_connection_error(e):
+                middle = len(rows) // 2
+                return self._write(rows[:middle], retry, failed) + self._write(rows[middle:], retry, failed)
+            for profile, task_id, token, attempts in rows:
+                if attempts + 1 >= self.max_attempts:
+                    failed.append((token, e))
+                else:
+                    retry.append((profile, task_id, token, attempts + 1))
+            return 0
+        if self.on_flush:
+            self.on_flush([token for _, _, token, _ in rows])
+        return written
+
+    def _give_up(self, failed):
+        for token, error in failed:
+            inc("failures_total", stage="bulk_write")
+            if self.on_failure:
+                self.on_failure(token, error)
+
+    def _flush_when_due(self):
+        while not self._stop.wait(min(self.max_age, 1.0)):
+            with self._lock:
+                due = self._oldest is not None and time.monotonic() - self._oldest >= self.max_age
+            if due:
+                self.flush()
+
+    def close(self):
+        # One last attempt; whatever still fails is given up now.
+        self._stop.set()
+        self._timer.join()
+        self.flush()
+        with self._lock:
+            left, self._pending = self._pending, []
+        self._give_up([(token, self.last_error) for _, _, token, _ in left])
 
-    conn.commit()
-    cursor.close()
-    conn.close()
+    def __enter__(self):
+        return self
 
-    
\ No newline at end of file
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,233 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from selenium.common.exceptions import WebDriverException
+import os
+import queue
+import sys
+import threading
+import time
+
+from metrics import CountingDriver, inc
+from normalize import canonical_profile_url
+from scraper import start_scrap
+from throttle import THROTTLE_RETRIES, ThrottledError
+
+
+POOL_SIZE = int(os.environ.get("LI_POOL_SIZE", 2))
+# Browsers get slower and leak memory over long sessions, so recycle them.
+MAX_PAGES_PER_DRIVER = int(os.environ.get("LI_MAX_PAGES_PER_DRIVER", 50))
+
+
+class PoolClosedError(RuntimeError):
+    pass
+
+
+class DriverPool:
+
+    def __init__(self, factory, size=POOL_SIZE, max_pages=MAX_PAGES_PER_DRIVER):
+        self.factory = factory
+        self.size = size
+        self.max_pages = max_pages
+
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._pages = {}
+        # Free pool positions. A browser takes one for its lifetime and the
+        # browser that replaces it gets it back, and with it the same
+        # persistent profile directory.
+        self._free_slots = set(range(size))
+        self._slots = {}
+        self._created = 0
+        self._closed = False
+
+    def acquire(self, timeout=None, **factory_options):
+        # factory_options go to the factory if a new browser has to be started.
+        while True:
+            if self._closed:
+                raise PoolClosedError("Driver pool is closed")
+
+            driver = self._take_idle_or_create(timeout, factory_options)
+            if self.is_healthy(driver):
+                return driver
+            inc("retries_total", kind="unhealthy_driver")
+            self._discard(driver)
+
+    def _take_idle_or_create(self, timeout, factory_options):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+                slot = min(self._free_slots)
+                self._free_slots.discard(slot)
+
+        if not can_create:
+            try:
+                return self._idle.get(timeout=timeout)
+            except queue.Empty:
+                raise TimeoutError("No browser became available in time") from None
+
+        try:
+            driver = self.factory(slot=slot, **factory_options)
+        except Exception:
+            with self._lock:
+                self._created -= 1
+                self._free_slots.add(slot)
+            raise
+        with self._lock:
+            self._pages[id(driver)] = 0
+            self._slots[id(driver)] = slot
+        return driver
+
+    def release(self, driver, failed=False, pages=1):
+        # pages: page loads made during the lease; max_pages counts loads, so
+        # a deep-mode lease (profile plus details pages) counts for each.
+        with self._lock:
+            pages = self._pages.get(id(driver), 0) + pages
+            self._pages[id(driver)] = pages
+            closed = self._closed
+
+        if closed or pages >= self.max_pages or (failed and not self.is_healthy(driver)):
+            self._discard(driver)
+        else:
+            self._idle.put(driver)
+
+    @contextmanager
+    def lease(self, timeout=None):
+        # Yields the browser wrapped in a CountingDriver, whose page loads are
+        # charged to the browser on release.
+        driver = self.acquire(timeout)
+        counting = CountingDriver(driver)
+        failed = False
+        try:
+            yield counting
+        except Exception:
+            failed = True
+            raise
+        finally:
+            self.release(driver, failed, pages=max(counting.pages, 1))
+
+    def is_healthy(self, driver):
+        try:
+            driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            slot = self._slots.pop(id(driver))
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        # Only once Chrome has exited: it locks its profile directory.
+        with self._lock:
+            self._free_slots.add(slot)
+            self._created -= 1
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+
+# Spreads start_scrap calls over the pool, one worker thread per browser.
+# With a FreshnessCache, profiles captured within its TTL (or already being
+# scraped) resolve to None instead of loading the page again. Marking a
+# profile fresh is left to the caller, once its result is actually saved. With an
+# AdaptiveThrottle, every page load waits for its token, and a throttle page
+# slows the whole session down and is retried after the cooldown.
+class ScrapeScheduler:
+
+    def __init__(self, pool, freshness=None, throttle=None, **scrap_options):
+        self.pool = pool
+        self.freshness = freshness
+        self.throttle = throttle
+        self.scrap_options = scrap_options
+        self._executor = ThreadPoolExecutor(
+            max_workers=pool.size, thread_name_prefix="scraper"
+        )
+        self._in_flight = set()
+        self._in_flight_lock = threading.Lock()
+
+    def submit(self, profile_url, force=False, **scrap_options):
+        key = canonical_profile_url(profile_url)
+        with self._in_flight_lock:
+            duplicate = key in self._in_flight
+            self._in_flight.add(key)
+        if duplicate and not force:
+            skipped = Future()
+            skipped.set_result(None)
+            return skipped
+
+        options = {**self.scrap_options, **scrap_options}
+        future = self._executor.submit(self._run, profile_url, force, options)
+        future.add_done_callback(lambda _: self._finish(key))
+        return future
+
+    def _finish(self, key):
+        with self._in_flight_lock:
+            self._in_flight.discard(key)
+
+    def _run(self, profile_url, force, options):
+        if self.freshness and not force and self.freshness.is_fresh(profile_url):
+            inc("profiles_total", status="skipped")
+            return None
+
+        if self.throttle:
+            # Details pages in deep mode take their own tokens.
+            options = {**options, "acquire": self.throttle.acquire}
+        for attempt in range(THROTTLE_RETRIES + 1):
+            if self.throttle:
+                self.throttle.acquire()
+            try:
+                data = self._scrape(profile_url, options)
+            except ThrottledError as e:
+                if self.throttle:
+                    pause = self.throttle.throttled(e.kind)
+                    print(f"[-] {e}; slowing down, pausing {pause:.0f}s", file=sys.stderr)
+                if not self.throttle or attempt == THROTTLE_RETRIES:
+                    # Counted once, when no retry is left.
+                    inc("profiles_total", status="failed")
+                    raise
+                inc("retries_total", kind="throttled")
+                continue
+            if self.throttle:
+                self.throttle.success()
+            break
+
+        inc("profiles_total", status="ok")
+        return data
+
+    def _scrape(self, profile_url, options):
+        timings = options.get("timings")
+        started = time.perf_counter()
+        with self.pool.lease() as driver:
+            leased = time.perf_counter()
+            try:
+                data = start_scrap(driver, profile_url, **options)
+            except ThrottledError:
+                # _run decides whether this attempt is retried.
+                raise
+            except Exception:
+                inc("profiles_total", status="failed")
+                raise
+            finally:
+                if timings is not None:
+                    timings["lease"] = leased - started
+                    timings["scrape"] = time.perf_counter() - leased
+        return data
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self.pool.close()
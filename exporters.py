@@ -0,0 +1,259 @@
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from datetime import date
+from importlib.util import find_spec
+
+from normalize import normalize_profiles
+from records import Profile, as_profile, flat_row
+
+
+# (column, source) pairs for the flat one-row-per-profile export. Sources are
+# keys of records.flat_row() plus the typed columns normalize_profiles() adds.
+EXPORT_COLUMNS = [
+    ("Name", "name"),
+    ("Headline", "headline"),
+    ("Location", "location"),
+    ("Connections", "connections"),
+    ("Followers", "followers"),
+    ("Last Activity", "last_activity"),
+    ("Profile URL", "profile_url"),
+    ("Job Title", "job_title"),
+    ("Company Name", "company_name"),
+    ("Company Link", "company_link"),
+    ("Company Location", "company_location"),
+    ("Work Mode", "work_mode"),
+    ("Total Duration", "total_duration"),
+    ("Job Type", "job_type"),
+    ("Duration", "duration"),
+    ("Tenurity", "tenurity"),
+    ("Skills", "skills"),
+    ("Experience", "experience_json"),
+    ("Connections Count", "connections_count"),
+    ("Followers Count", "followers_count"),
+    ("Start Date", "start_date"),
+    ("End Date", "end_date"),
+    ("Current Role", "is_current"),
+    ("Duration (months)", "duration_months"),
+    ("Total Duration (months)", "total_duration_months"),
+]
+
+TYPED_EXPORT_COLUMNS = {
+    "Connections Count": "int64",
+    "Followers Count": "int64",
+    "Start Date": "date32",
+    "End Date": "date32",
+    "Current Role": "bool_",
+    "Duration (months)": "int64",
+    "Total Duration (months)": "int64",
+}
+
+PARQUET_ROW_GROUP_SIZE = 500
+# Most profiles a background export flattens in one normalize_profiles() call.
+EXPORT_BATCH_SIZE = 100
+
+_STOP = object()
+
+
+def flatten_profiles(profiles):
+    # One normalize_profiles() call for the whole batch: building the
+    # DataFrame costs the same for one row as for a hundred.
+    # Missing values stay None: empty in CSV, null in Parquet.
+    rows = normalize_profiles([flat_row(profile) for profile in profiles])
+    flattened = []
+    for profile, row in zip(profiles, rows):
+        row["experience_json"] = json.dumps(
+            [entry.to_dict() for entry in profile.experience], ensure_ascii=False
+        )
+        flattened.append({column: row.get(source) for column, source in EXPORT_COLUMNS})
+    return flattened
+
+
+class JsonlSink:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, profile, row):
+        self._file.write(profile.to_json() + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class CsvSink:
+
+    def __init__(self, path):
+        self.path = path
+        new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, "a", encoding="utf-8", newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=[column for column, _ in EXPORT_COLUMNS])
+        if new_file:
+            self._writer.writeheader()
+
+    def append(self, profile, row):
+        self._writer.writerow({
+            column: value.isoformat() if isinstance(value, date) else value
+            for column, value in row.items()
+        })
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class ParquetSink:
+    # Rows are buffered and written one row group at a time, so memory stays
+    # bounded by row_group_size however long the session runs. pyarrow is only
+    # imported, and the file only created, when the first row group is written.
+
+    def __init__(self, path, row_group_size=PARQUET_ROW_GROUP_SIZE):
+        if find_spec("pyarrow") is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        self.path = path
+        self.row_group_size = row_group_size
+        self.schema = None
+        self._rows = []
+        self._writer = None
+
+    def _open(self):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.schema = pa.schema([
+            (column, getattr(pa, TYPED_EXPORT_COLUMNS.get(column, "string"))())
+            for column, _ in EXPORT_COLUMNS
+        ])
+        self._writer = pq.ParquetWriter(self.path, self.schema)
+
+    def append(self, profile, row):
+        self._rows.append(row)
+        if len(self._rows) >= self.row_group_size:
+            self.flush()
+
+    def flush(self):
+        if self._rows:
+            import pyarrow as pa
+
+            if self._writer is None:
+                self._open()
+            self._writer.write_table(pa.Table.from_pylist(self._rows, schema=self.schema))
+            self._rows = []
+
+    def close(self):
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class ExportSession:
+    # One set of append-only files per session; every result is flattened once
+    # and appended to each sink.
+    #
+    # With background=True, append() only queues the profile. A worker thread
+    # flattens whatever has queued up in one batch and appends it to the
+    # sinks, so the caller (the GUI thread) never waits on pandas or the disk;
+    # errors go to on_error. run() queues other work on the files (such as an
+    # Excel conversion) behind the rows appended before it.
+
+    def __init__(self, base_dir, formats=("jsonl", "csv", "parquet"), background=False, on_error=None):
+        stamp = int(time.time())
+        self.sinks = {}
+        self.errors = {}
+        targets = {
+            "jsonl": (JsonlSink, "JSON Files", "jsonl"),
+            "csv": (CsvSink, "CSV Files", "csv"),
+            "parquet": (ParquetSink, "Parquet Files", "parquet"),
+        }
+        for name in formats:
+            sink_class, folder, extension = targets[name]
+            path = os.path.join(base_dir, folder, f"profiles_{stamp}.{extension}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                self.sinks[name] = sink_class(path)
+            except RuntimeError as e:
+                self.errors[name] = str(e)
+        self.count = 0
+        self.on_error = on_error
+
+        self._queue = None
+        if background:
+            self._queue = queue.Queue()
+            self._thread = threading.Thread(target=self._run, name="exports", daemon=True)
+            self._thread.start()
+
+    def append(self, profile):
+        if self._queue is not None:
+            self._queue.put(as_profile(profile))
+        else:
+            self.append_many([profile])
+
+    def append_many(self, profiles):
+        profiles = [as_profile(profile) for profile in profiles]
+        for profile, row in zip(profiles, flatten_profiles(profiles)):
+            for sink in self.sinks.values():
+                sink.append(profile, row)
+        self.count += len(profiles)
+
+    def run(self, task):
+        if self._queue is not None:
+            self._queue.put(task)
+        else:
+            task()
+
+    def _run(self):
+        while True:
+            # A batch is a run of profiles, possibly ended by a task or _STOP.
+            batch = [self._queue.get()]
+            while len(batch) < EXPORT_BATCH_SIZE and isinstance(batch[-1], Profile):
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            last = batch[-1]
+            try:
+                profiles = [item for item in batch if isinstance(item, Profile)]
+                if profiles:
+                    self._guarded(self.append_many, profiles)
+                if not isinstance(last, Profile) and last is not _STOP:
+                    self._guarded(last)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if last is _STOP:
+                return
+
+    def _guarded(self, function, *args):
+        try:
+            function(*args)
+        except Exception as e:
+            if self.on_error:
+                self.on_error(e)
+
+    def path(self, name):
+        sink = self.sinks.get(name)
+        return sink.path if sink else None
+
+    def close(self):
+        if self._queue is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+        for sink in self.sinks.values():
+            sink.close()
+
+
+def export_excel(source_path, excel_path):
+    # Excel cannot be appended to cheaply, so it is built on demand from a sink.
+    import pandas as pd
+
+    if source_path.endswith(".parquet"):
+        frame = pd.read_parquet(source_path)
+    else:
+        frame = pd.read_csv(source_path)
+    frame.to_excel(excel_path, index=False)
+    return excel_path
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import os
+import sys
+import threading
+
+from normalize import canonical_profile_url
+
+
+FRESHNESS_TTL = timedelta(hours=float(os.environ.get("LI_FRESHNESS_TTL_HOURS", 24 * 7)))
+FRESHNESS_CACHE_SIZE = 10_000
+
+
+def _default_lookup(profile_url):
+    # Imported here so the cache works without a database (e.g. --no-db runs).
+    from database import get_last_captured
+    return get_last_captured(profile_url)
+
+
+# Answers "was this profile captured within the TTL?" from an in-memory LRU,
+# falling back to li_person_master for profiles the cache has not seen.
+class FreshnessCache:
+
+    def __init__(self, ttl=FRESHNESS_TTL, capacity=FRESHNESS_CACHE_SIZE,
+                 lookup=_default_lookup, now=datetime.now):
+        self.ttl = ttl
+        self.capacity = capacity
+        self.lookup = lookup
+        self.now = now
+
+        self._captured = OrderedDict()
+        self._lock = threading.Lock()
+
+    def captured_at(self, profile_url):
+        key = canonical_profile_url(profile_url)
+        with self._lock:
+            if key in self._captured:
+                self._captured.move_to_end(key)
+                return self._captured[key]
+
+        captured = None
+        if self.lookup:
+            try:
+                captured = self.lookup(key)
+            except Exception as e:
+                print(f"[-] Freshness lookup failed for {key}: {e}", file=sys.stderr)
+                return None
+        if captured is not None:
+            self._remember(key, captured)
+        return captured
+
+    def is_fresh(self, profile_url):
+        captured = self.captured_at(profile_url)
+        return captured is not None and self.now() - captured < self.ttl
+
+    def mark(self, profile_url, captured=None):
+        self._remember(canonical_profile_url(profile_url), captured or self.now())
+
+    def _remember(self, key, captured):
+        with self._lock:
+            self._captured[key] = captured
+            self._captured.move_to_end(key)
+            while len(self._captured) > self.capacity:
+                self._captured.popitem(last=False)
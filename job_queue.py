@@ -0,0 +1,435 @@
+from contextlib import contextmanager
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+
+from normalize import canonical_profile_url, profile_key
+
+
+JOB_QUEUE_FILE = "scrape_jobs.sqlite3"
+# A claimed job goes back to pending if its worker stops heartbeating this long.
+LEASE_SECONDS = 600
+MAX_ATTEMPTS = 3
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scrape_jobs (
+    profile_url TEXT PRIMARY KEY,
+    source_url TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    last_error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scrape_jobs_state ON scrape_jobs (state, lease_expires);
+"""
+
+
+def worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _process_alive(pid):
+    if sys.platform == "win32":
+        # os.kill(pid, 0) would send CTRL_C_EVENT on Windows; ask the kernel instead.
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+            return code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Persistent queue of profile URLs in a local SQLite file. Jobs move
+# pending -> running (leased) -> done | failed, and failed attempts go back to
+# pending until MAX_ATTEMPTS is reached. Safe to share between threads and
+# between processes on one machine.
+class JobQueue:
+
+    def __init__(self, path=JOB_QUEUE_FILE, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        # IMMEDIATE takes the write lock up front, so two workers can never
+        # claim the same rows.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def enqueue(self, urls):
+        now = time.time()
+        rows = [(canonical_profile_url(url), url, now, now) for url in urls]
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO scrape_jobs (profile_url, source_url, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows
+            )
+            return conn.total_changes - before
+
+    def claim(self, owner, limit=1):
+        now = time.time()
+        with self._transaction() as conn:
+            # An expired lease is only claimed again while the job has attempts
+            # left; one that keeps killing its worker fails here instead.
+            conn.execute(
+                "UPDATE scrape_jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, "
+                "last_error = 'lease expired', updated_at = ? "
+                "WHERE state = ? AND lease_expires < ? AND attempts >= ?",
+                (FAILED, now, RUNNING, now, self.max_attempts)
+            )
+            rows = conn.execute(
+                "SELECT profile_url, source_url FROM scrape_jobs "
+                "WHERE state = ? OR (state = ? AND lease_expires < ?) "
+                "ORDER BY created_at LIMIT ?",
+                (PENDING, RUNNING, now, limit)
+            ).fetchall()
+            conn.executemany(
+                "UPDATE scrape_jobs SET state = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE profile_url = ?",
+                [(RUNNING, owner, now + self.lease_seconds, now, key) for key, _ in rows]
+            )
+        return [source_url for _, source_url in rows]
+
+    def heartbeat(self, owner):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE scrape_jobs SET lease_expires = ?, updated_at = ? "
+                "WHERE state = ? AND lease_owner = ?",
+                (now + self.lease_seconds, now, RUNNING, owner)
+            )
+
+    def complete(self, urls):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE scrape_jobs SET state = ?, lease_owner = NULL, lease_expires = NULL, "
+                "last_error = NULL, updated_at = ? WHERE profile_url = ?",
+                [(DONE, now, canonical_profile_url(url)) for url in urls]
+            )
+
+    def fail(self, url, error):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE scrape_jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = ?, updated_at = ? "
+                "WHERE profile_url = ?",
+                (self.max_attempts, FAILED, PENDING, str(error), now, canonical_profile_url(url))
+            )
+
+    def release(self, urls):
+        # Claimed jobs that never started (budget used up, logged out,
+        # interrupted) go back to pending with their attempt refunded.
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(
+                "UPDATE scrape_jobs SET state = ?, attempts = MAX(attempts, 1) - 1, lease_owner = NULL, "
+                "lease_expires = NULL, updated_at = ? WHERE profile_url = ? AND state = ?",
+                [(PENDING, now, canonical_profile_url(url), RUNNING) for url in urls]
+            )
+
+    def recover(self):
+        # Resume after a crash: jobs leased by processes on this machine that no
+        # longer exist go straight back to pending instead of waiting out the lease.
+        host = socket.gethostname()
+        with self._transaction() as conn:
+            owners = conn.execute(
+                "SELECT DISTINCT lease_owner FROM scrape_jobs WHERE state = ?", (RUNNING,)
+            ).fetchall()
+            dead = [
+                owner for (owner,) in owners
+                if owner and owner.rsplit(":", 1)[0] == host
+                and not _process_alive(int(owner.rsplit(":", 1)[1]))
+            ]
+            before = conn.total_changes
+            conn.executemany(
+                "UPDATE scrape_jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = 'worker exited' "
+                "WHERE state = ? AND lease_owner = ?",
+                [(self.max_attempts, FAILED, PENDING, RUNNING, owner) for owner in dead]
+            )
+            return conn.total_changes - before
+
+    def reclaim_expired(self):
+        now = time.time()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.execute(
+                "UPDATE scrape_jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = 'lease expired', "
+                "updated_at = ? WHERE state = ? AND lease_expires < ?",
+                (self.max_attempts, FAILED, PENDING, now, RUNNING, now)
+            )
+            return conn.total_changes - before
+
+    def retry_failed(self):
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.execute(
+                "UPDATE scrape_jobs SET state = ?, attempts = 0, updated_at = ? WHERE state = ?",
+                (PENDING, time.time(), FAILED)
+            )
+            return conn.total_changes - before
+
+    def nodes(self):
+        # Live leases per worker: owner -> (jobs held, seconds until the lease lapses).
+        rows = self._connection().execute(
+            "SELECT lease_owner, COUNT(*), MIN(lease_expires) FROM scrape_jobs "
+            "WHERE state = ? GROUP BY lease_owner",
+            (RUNNING,)
+        ).fetchall()
+        now = time.time()
+        return {owner: (held, int(expires - now)) for owner, held, expires in rows}
+
+    def throughput(self, minutes=60):
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM scrape_jobs WHERE state = ? AND updated_at >= ?",
+            (DONE, time.time() - minutes * 60)
+        ).fetchone()[0]
+
+    def counts(self):
+        rows = self._connection().execute(
+            "SELECT state, COUNT(*) FROM scrape_jobs GROUP BY state"
+        ).fetchall()
+        return {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(rows)}
+
+
+SHARED_QUEUE = "mysql"
+# URLs per INSERT when enqueueing into the shared queue.
+ENQUEUE_BATCH = 500
+
+
+# The same queue in the scrape_jobs table of the MySQL database, shared by
+# every node pointed at it. Lease times use the server clock, so nodes with
+# drifting clocks still agree on when a lease has expired. A claim is a single
+# UPDATE ... ORDER BY ... LIMIT that stamps a fresh claim token on the rows it
+# locks (MariaDB 10.4 has no SKIP LOCKED); two nodes can never claim the same row.
+class MySqlJobQueue:
+
+    def __init__(self, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = SHARED_QUEUE
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    @contextmanager
+    def _cursor(self):
+        # Imported here so the SQLite queue works without the MySQL connector.
+        from database import get_connection
+
+        conn = get_connection()
+        try:
+            cursor = conn.cursor()
+            yield cursor
+            conn.commit()
+            cursor.close()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def enqueue(self, urls):
+        added = 0
+        rows = []
+        for url in urls:
+            rows.append((profile_key(url), canonical_profile_url(url), url))
+            if len(rows) >= ENQUEUE_BATCH:
+                added += self._insert(rows)
+                rows = []
+        return added + (self._insert(rows) if rows else 0)
+
+    def _insert(self, rows):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "INSERT IGNORE INTO scrape_jobs (profile_key, profile_url, source_url) VALUES "
+                + ",".join(["(%s, %s, %s)"] * len(rows)),
+                [value for row in rows for value in row]
+            )
+            return cursor.rowcount
+
+    def claim(self, owner, limit=1):
+        token = uuid.uuid4().hex
+        with self._cursor() as cursor:
+            # As in JobQueue.claim: out of attempts, an expired lease fails.
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = %s, lease_owner = NULL, lease_expires = NULL, "
+                "last_error = 'lease expired', updated_at = NOW() "
+                "WHERE state = %s AND lease_expires < NOW() AND attempts >= %s",
+                (FAILED, RUNNING, self.max_attempts)
+            )
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = %s, attempts = attempts + 1, lease_owner = %s, "
+                "claim_token = %s, lease_expires = NOW() + INTERVAL %s SECOND, updated_at = NOW() "
+                "WHERE state = %s OR (state = %s AND lease_expires < NOW()) "
+                "ORDER BY created_at LIMIT %s",
+                (RUNNING, owner, token, self.lease_seconds, PENDING, RUNNING, limit)
+            )
+            cursor.execute(
+                "SELECT source_url FROM scrape_jobs WHERE claim_token = %s ORDER BY created_at",
+                (token,)
+            )
+            return [source_url for (source_url,) in cursor.fetchall()]
+
+    def heartbeat(self, owner):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_jobs SET lease_expires = NOW() + INTERVAL %s SECOND, updated_at = NOW() "
+                "WHERE state = %s AND lease_owner = %s",
+                (self.lease_seconds, RUNNING, owner)
+            )
+
+    def complete(self, urls):
+        keys = [profile_key(url) for url in urls]
+        if not keys:
+            return
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = %s, lease_owner = NULL, lease_expires = NULL, "
+                "last_error = NULL, updated_at = NOW() "
+                f"WHERE profile_key IN ({','.join(['%s'] * len(keys))})",
+                [DONE] + keys
+            )
+
+    def fail(self, url, error):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = CASE WHEN attempts >= %s THEN %s ELSE %s END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = %s, updated_at = NOW() "
+                "WHERE profile_key = %s",
+                (self.max_attempts, FAILED, PENDING, str(error)[:1000], profile_key(url))
+            )
+
+    def release(self, urls):
+        # As JobQueue.release: unstarted jobs back to pending, attempt refunded.
+        keys = [profile_key(url) for url in urls]
+        if not keys:
+            return
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = %s, attempts = GREATEST(attempts, 1) - 1, "
+                "lease_owner = NULL, lease_expires = NULL, updated_at = NOW() "
+                f"WHERE state = %s AND profile_key IN ({','.join(['%s'] * len(keys))})",
+                [PENDING, RUNNING] + keys
+            )
+
+    def recover(self):
+        # Leases held by dead processes on this machine go back to pending now;
+        # leases of dead nodes elsewhere are reclaimed once they expire.
+        host = socket.gethostname()
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT DISTINCT lease_owner FROM scrape_jobs WHERE state = %s AND lease_owner LIKE %s",
+                (RUNNING, f"{host}:%")
+            )
+            dead = [
+                owner for (owner,) in cursor.fetchall()
+                if not _process_alive(int(owner.rsplit(":", 1)[1]))
+            ]
+            recovered = 0
+            for owner in dead:
+                cursor.execute(
+                    "UPDATE scrape_jobs SET state = CASE WHEN attempts >= %s THEN %s ELSE %s END, "
+                    "lease_owner = NULL, lease_expires = NULL, last_error = 'worker exited' "
+                    "WHERE state = %s AND lease_owner = %s",
+                    (self.max_attempts, FAILED, PENDING, RUNNING, owner)
+                )
+                recovered += cursor.rowcount
+            return recovered
+
+    def reclaim_expired(self):
+        # Expired leases: back to pending, or failed once out of attempts.
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = CASE WHEN attempts >= %s THEN %s ELSE %s END, "
+                "lease_owner = NULL, lease_expires = NULL, last_error = 'lease expired', "
+                "updated_at = NOW() WHERE state = %s AND lease_expires < NOW()",
+                (self.max_attempts, FAILED, PENDING, RUNNING)
+            )
+            return cursor.rowcount
+
+    def retry_failed(self):
+        with self._cursor() as cursor:
+            cursor.execute(
+                "UPDATE scrape_jobs SET state = %s, attempts = 0, updated_at = NOW() WHERE state = %s",
+                (PENDING, FAILED)
+            )
+            return cursor.rowcount
+
+    def counts(self):
+        with self._cursor() as cursor:
+            cursor.execute("SELECT state, COUNT(*) FROM scrape_jobs GROUP BY state")
+            return {PENDING: 0, RUNNING: 0, DONE: 0, FAILED: 0, **dict(cursor.fetchall())}
+
+    def nodes(self):
+        # Live leases per node: owner -> (jobs held, seconds until the lease lapses).
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT lease_owner, COUNT(*), TIMESTAMPDIFF(SECOND, NOW(), MIN(lease_expires)) "
+                "FROM scrape_jobs WHERE state = %s GROUP BY lease_owner",
+                (RUNNING,)
+            )
+            return {owner: (held, expires) for owner, held, expires in cursor.fetchall()}
+
+    def throughput(self, minutes=60):
+        # Jobs finished across all nodes in the last `minutes`.
+        with self._cursor() as cursor:
+            cursor.execute(
+                "SELECT COUNT(*) FROM scrape_jobs WHERE state = %s "
+                "AND updated_at >= NOW() - INTERVAL %s MINUTE",
+                (DONE, minutes)
+            )
+            return cursor.fetchone()[0]
+
+
+def open_queue(path=JOB_QUEUE_FILE, **options):
+    # "mysql" selects the shared queue; anything else is a local SQLite file.
+    if path == SHARED_QUEUE:
+        return MySqlJobQueue(**options)
+    return JobQueue(path, **options)
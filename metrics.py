@@ -0,0 +1,202 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import threading
+import time
+
+
+METRICS_FILE = os.environ.get("LI_METRICS_FILE", "scraper_metrics.prom")
+PREFIX = "linkedin_scraper"
+
+HELP = {
+    "stage_seconds": ("summary", "Time spent in each scrape stage."),
+    "driver_calls_total": ("counter", "WebDriver round trips by call."),
+    "retries_total": ("counter", "Retried operations by kind."),
+    "failures_total": ("counter", "Failed operations by stage."),
+    "profiles_total": ("counter", "Profiles processed by outcome."),
+    "throttled_total": ("counter", "Throttle or checkpoint pages served, by kind."),
+    "profile_changes_total": ("counter", "Saved profiles by change status (new, changed, unchanged)."),
+    "details_scrolls_total": ("counter", "Scroll rounds on details pages in deep mode, by page."),
+}
+
+
+def _labels(labels):
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+# Thread-safe in-process registry of counters and timing summaries, rendered in
+# the Prometheus text exposition format.
+class Metrics:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._summaries = {}
+
+    def inc(self, name, value=1, **labels):
+        with self._lock:
+            self._counters[(name, _labels(labels))] += value
+
+    def observe(self, name, seconds, **labels):
+        key = (name, _labels(labels))
+        with self._lock:
+            count, total, longest = self._summaries.get(key, (0, 0.0, 0.0))
+            self._summaries[key] = (count + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc("failures_total", stage=stage)
+            raise
+        finally:
+            self.observe("stage_seconds", time.perf_counter() - started, stage=stage)
+
+    def stage_summary(self):
+        # stage -> (count, mean seconds, max seconds), for the GUI panel.
+        with self._lock:
+            items = list(self._summaries.items())
+        return {
+            dict(labels)["stage"]: (count, total / count, longest)
+            for (name, labels), (count, total, longest) in items
+            if name == "stage_seconds" and count
+        }
+
+    def counter_total(self, name):
+        with self._lock:
+            return sum(value for (metric, _), value in self._counters.items() if metric == name)
+
+    def render(self):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            summaries = sorted(self._summaries.items())
+
+        lines = []
+        described = set()
+
+        def describe(name):
+            if name not in described:
+                kind, text = HELP.get(name, ("untyped", name))
+                lines.append(f"# HELP {PREFIX}_{name} {text}")
+                lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+                described.add(name)
+
+        for (name, labels), value in counters:
+            describe(name)
+            lines.append(f"{PREFIX}_{name}{_format_labels(labels)} {value:g}")
+        for (name, labels), (count, total, longest) in summaries:
+            describe(name)
+            lines.append(f"{PREFIX}_{name}_count{_format_labels(labels)} {count}")
+            lines.append(f"{PREFIX}_{name}_sum{_format_labels(labels)} {total:.6f}")
+        for (name, labels), (count, total, longest) in summaries:
+            if f"{name}_max" not in described:
+                lines.append(f"# TYPE {PREFIX}_{name}_max gauge")
+                described.add(f"{name}_max")
+            lines.append(f"{PREFIX}_{name}_max{_format_labels(labels)} {longest:.6f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, path=METRICS_FILE):
+        # Written atomically so a scraper (e.g. node_exporter textfile) never reads half a file.
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp, path)
+
+    def serve(self, port, host="0.0.0.0"):
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+        return server
+
+
+REGISTRY = Metrics()
+span = REGISTRY.span
+inc = REGISTRY.inc
+
+
+class CountingElement:
+
+    def __init__(self, element, registry):
+        self._element = element
+        self._registry = registry
+
+    @property
+    def text(self):
+        self._registry.inc("driver_calls_total", call="text")
+        return self._element.text
+
+    def get_attribute(self, name):
+        self._registry.inc("driver_calls_total", call="get_attribute")
+        return self._element.get_attribute(name)
+
+    def find_element(self, by, value):
+        self._registry.inc("driver_calls_total", call="find_element")
+        return CountingElement(self._element.find_element(by, value), self._registry)
+
+    def find_elements(self, by, value):
+        self._registry.inc("driver_calls_total", call="find_elements")
+        return [CountingElement(e, self._registry) for e in self._element.find_elements(by, value)]
+
+    def __getattr__(self, name):
+        return getattr(self._element, name)
+
+
+# Wraps a WebDriver so every round trip the scraper makes is counted.
+class CountingDriver:
+
+    def __init__(self, driver, registry=REGISTRY):
+        self._driver = driver
+        self._registry = registry
+        # Page loads through this wrapper, for DriverPool's recycling.
+        self.pages = 0
+
+    @property
+    def current_url(self):
+        self._registry.inc("driver_calls_total", call="current_url")
+        return self._driver.current_url
+
+    @property
+    def page_source(self):
+        self._registry.inc("driver_calls_total", call="page_source")
+        return self._driver.page_source
+
+    def get(self, url):
+        self._registry.inc("driver_calls_total", call="get")
+        self.pages += 1
+        return self._driver.get(url)
+
+    def find_element(self, by, value):
+        self._registry.inc("driver_calls_total", call="find_element")
+        return CountingElement(self._driver.find_element(by, value), self._registry)
+
+    def find_elements(self, by, value):
+        self._registry.inc("driver_calls_total", call="find_elements")
+        return [CountingElement(e, self._registry) for e in self._driver.find_elements(by, value)]
+
+    def __getattr__(self, name):
+        return getattr(self._driver, name)
@@ -0,0 +1,177 @@
+import argparse
+import json
+import os
+import sys
+from collections import defaultdict
+
+from database import get_connection, replace_details
+from normalize import canonical_profile_url, normalize_experiences, profile_key
+
+
+# Upgrades an existing database to the current schema (typed columns,
+# profile_key, li_experience, li_skill, scrape_jobs, change fingerprints,
+# headline length). Safe to re-run: finished steps are skipped, and detail rows
+# are only backfilled for profiles that have none.
+#
+#   python migrate.py
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sql_files", "migrations")
+BACKFILL_PAGE_SIZE = 500
+
+
+def sql_statements(path):
+    # The migration files are plain DDL: no semicolons inside strings.
+    with open(path, encoding="utf-8") as f:
+        lines = [line for line in f if not line.lstrip().startswith("--")]
+    return [statement.strip() for statement in "".join(lines).split(";") if statement.strip()]
+
+
+def apply_sql(cursor, filename):
+    print(f"[+] Applying {filename}")
+    for statement in sql_statements(os.path.join(MIGRATIONS_DIR, filename)):
+        cursor.execute(statement)
+
+
+def has_column(cursor, table, column):
+    cursor.execute(f"SHOW COLUMNS FROM {table} LIKE %s", (column,))
+    return cursor.fetchone() is not None
+
+
+def column_type(cursor, table, column):
+    cursor.execute(f"SHOW COLUMNS FROM {table} LIKE %s", (column,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return row[1].decode() if isinstance(row[1], bytes) else row[1]
+
+
+def has_table(cursor, table):
+    cursor.execute("SHOW TABLES LIKE %s", (table,))
+    return cursor.fetchone() is not None
+
+
+def has_index(cursor, table, index):
+    cursor.execute(f"SHOW INDEX FROM {table} WHERE Key_name = %s", (index,))
+    return bool(cursor.fetchall())
+
+
+def backfill_keys(cursor):
+    # The old unique index was on the raw URL, so one profile can be in
+    # li_person_master under several spellings. Keep its latest capture only.
+    cursor.execute(
+        "SELECT task_id, profile_url FROM li_person_master "
+        "ORDER BY COALESCE(updated_at, inserted_at) DESC, task_id DESC"
+    )
+    latest, stale = {}, []
+    for task_id, url in cursor.fetchall():
+        key = profile_key(url)
+        if key in latest:
+            stale.append(task_id)
+        else:
+            latest[key] = (task_id, canonical_profile_url(url))
+
+    for start in range(0, len(stale), BACKFILL_PAGE_SIZE):
+        chunk = stale[start:start + BACKFILL_PAGE_SIZE]
+        cursor.execute(
+            f"DELETE FROM li_person_master WHERE task_id IN ({','.join(['%s'] * len(chunk))})", chunk
+        )
+    cursor.executemany(
+        "UPDATE li_person_master SET profile_url = %s, profile_key = %s WHERE task_id = %s",
+        [(url, key, task_id) for key, (task_id, url) in latest.items()]
+    )
+
+    cursor.execute("SELECT task_id, profile_url FROM li_person")
+    cursor.executemany(
+        "UPDATE li_person SET profile_url = %s, profile_key = %s WHERE task_id = %s",
+        [(canonical_profile_url(url), profile_key(url), task_id) for task_id, url in cursor.fetchall()]
+    )
+    print(f"[+] Keyed {len(latest)} profiles, removed {len(stale)} duplicates")
+
+
+def backfill_details(conn):
+    # Pages through li_person_master by primary key and builds li_experience and
+    # li_skill rows from experience_json and skills, for profiles that have
+    # none yet. Profiles captured since 002 already have exact rows from
+    # replace_details, which the lossy comma-joined skills must not overwrite.
+    cursor = conn.cursor()
+    last_key, total = "", 0
+    while True:
+        cursor.execute(
+            "SELECT m.profile_key, m.task_id, m.skills, m.experience_json FROM li_person_master m "
+            "WHERE m.profile_key > %s "
+            "AND NOT EXISTS (SELECT 1 FROM li_experience e WHERE e.profile_key = m.profile_key) "
+            "AND NOT EXISTS (SELECT 1 FROM li_skill s WHERE s.profile_key = m.profile_key) "
+            "ORDER BY m.profile_key LIMIT %s",
+            (last_key, BACKFILL_PAGE_SIZE)
+        )
+        rows = cursor.fetchall()
+        if not rows:
+            break
+
+        experiences = defaultdict(list)
+        for key, _, _, experience_json in rows:
+            try:
+                experiences[key] = json.loads(experience_json or "[]")
+            except ValueError:
+                print(f"[-] Unreadable experience_json for {key}, skipped")
+
+        # Typed fields for every entry of the page in one normalize pass.
+        typed = iter(normalize_experiences(
+            [experience for key, *_ in rows for experience in experiences[key]]
+        ))
+        profiles = [
+            ({
+                "profile_key": key,
+                "experience_json": [next(typed) for _ in experiences[key]],
+                # Skills were stored comma-joined, so a skill containing ", "
+                # comes back split; new captures keep the scraped list.
+                "skill_list": [skill.strip() for skill in (skills or "").split(",") if skill.strip()],
+            }, task_id)
+            for key, task_id, skills, _ in rows
+        ]
+        replace_details(cursor, profiles)
+        conn.commit()
+
+        total += len(rows)
+        last_key = rows[-1][0]
+    cursor.close()
+    print(f"[+] Backfilled experience and skills for {total} profiles")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migrate linkedin_db to the current schema.")
+    parser.parse_args(argv)
+
+    conn = get_connection()
+    try:
+        cursor = conn.cursor()
+        if not has_column(cursor, "li_person_master", "connections_count"):
+            apply_sql(cursor, "001_typed_columns.sql")
+        if not has_column(cursor, "li_person_master", "profile_key"):
+            apply_sql(cursor, "002_normalized_details.sql")
+
+        if has_index(cursor, "li_person_master", "person_link"):
+            try:
+                backfill_keys(cursor)
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            apply_sql(cursor, "003_profile_key_primary.sql")
+        if not has_table(cursor, "scrape_jobs"):
+            apply_sql(cursor, "004_scrape_jobs.sql")
+        if not has_column(cursor, "li_person_master", "fingerprint_basic"):
+            apply_sql(cursor, "005_change_detection.sql")
+        if column_type(cursor, "li_person_master", "headline") == "varchar(150)":
+            apply_sql(cursor, "006_headline_length.sql")
+        cursor.close()
+
+        backfill_details(conn)
+    finally:
+        conn.close()
+    print("[+] Migration complete")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,194 @@
+import hashlib
+import json
+import re
+from urllib.parse import urlsplit, urlunsplit
+
+
+# pandas is imported inside the functions that need it: importing it costs more
+# than the rest of the application's startup, and only writes and exports use it.
+
+MONTHS = {
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "may": 5, "jun": 6,
+    "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+
+_month = r'(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|June?|July?|Aug(?:ust)?|Sep(?:t)?(?:ember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)'
+
+# Compiled once at import; these run over every row of every batch.
+DATE_RANGE_PATTERN = re.compile(
+    rf'(?:(?P<start_month>{_month})\s+)?(?P<start_year>(?:19|20)\d{{2}})'
+    r'\s*[–-]\s*'
+    rf'(?:(?P<current>Present|Current)|(?:(?P<end_month>{_month})\s+)?(?P<end_year>(?:19|20)\d{{2}}))',
+    re.IGNORECASE
+)
+YEARS_PATTERN = re.compile(r'(\d+)\s*yrs?\b', re.IGNORECASE)
+MONTHS_PATTERN = re.compile(r'(\d+)\s*mos?\b', re.IGNORECASE)
+COUNT_PATTERN = re.compile(r'(?P<number>\d[\d,]*(?:\.\d+)?)\s*(?P<suffix>[KM])?\+?', re.IGNORECASE)
+
+COUNT_SUFFIXES = {"K": 1_000, "M": 1_000_000}
+
+TYPED_PROFILE_COLUMNS = [
+    "connections_count", "followers_count", "start_date", "end_date",
+    "is_current", "duration_months", "total_duration_months"
+]
+
+
+def _text(series):
+    return series.astype("string").fillna("")
+
+
+def count_column(series):
+    import pandas as pd
+    parts = _text(series).str.extract(COUNT_PATTERN)
+    number = pd.to_numeric(parts["number"].str.replace(",", "", regex=False), errors="coerce")
+    scale = parts["suffix"].str.upper().map(COUNT_SUFFIXES).fillna(1)
+    return (number * scale).round().astype("Int64")
+
+
+def months_column(series):
+    import pandas as pd
+    text = _text(series)
+    years = pd.to_numeric(text.str.extract(YEARS_PATTERN)[0], errors="coerce")
+    months = pd.to_numeric(text.str.extract(MONTHS_PATTERN)[0], errors="coerce")
+    total = years.fillna(0) * 12 + months.fillna(0)
+    return total.where(years.notna() | months.notna()).astype("Int64")
+
+
+def _month_start(month_names, years):
+    import pandas as pd
+    months = month_names.str.slice(0, 3).str.lower().map(MONTHS).astype("float").fillna(1)
+    years = pd.to_numeric(years, errors="coerce").astype("float")
+    dates = pd.to_datetime(
+        pd.DataFrame({"year": years, "month": months, "day": 1}), errors="coerce"
+    )
+    return dates.dt.date.where(dates.notna(), None)
+
+
+def date_range_columns(series):
+    parts = _text(series).str.extract(DATE_RANGE_PATTERN)
+    is_current = parts["current"].notna()
+    start = _month_start(parts["start_month"], parts["start_year"])
+    end = _month_start(parts["end_month"], parts["end_year"])
+    return start, end, is_current.where(parts["start_year"].notna())
+
+
+def _column(frame, name):
+    import pandas as pd
+    if name in frame:
+        return frame[name]
+    return pd.Series(pd.NA, index=frame.index, dtype="string")
+
+
+def _records(frame):
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+def normalize_profiles(profiles):
+    # Adds typed columns to a batch of prepare_profile_for_db() dicts, parsing
+    # each raw display string once per batch with vectorized string ops.
+    if not profiles:
+        return []
+
+    import pandas as pd
+    frame = pd.DataFrame(profiles)
+    typed = pd.DataFrame(index=frame.index)
+    typed["connections_count"] = count_column(_column(frame, "connections"))
+    typed["followers_count"] = count_column(_column(frame, "followers"))
+    typed["start_date"], typed["end_date"], typed["is_current"] = date_range_columns(
+        _column(frame, "tenurity")
+    )
+    typed["duration_months"] = months_column(_column(frame, "duration"))
+    typed["total_duration_months"] = months_column(_column(frame, "total_duration"))
+
+    return [
+        {**profile, **extra}
+        for profile, extra in zip(profiles, _records(typed[TYPED_PROFILE_COLUMNS]))
+    ]
+
+
+def normalize_experiences(experiences):
+    # Same typed fields for individual experience entries, with ISO date
+    # strings so the result stays JSON serializable.
+    if not experiences:
+        return []
+
+    import pandas as pd
+    frame = pd.DataFrame(experiences)
+    start, end, is_current = date_range_columns(_column(frame, "tenurity"))
+    typed = pd.DataFrame({
+        "start_date": start.map(lambda d: d.isoformat(), na_action="ignore"),
+        "end_date": end.map(lambda d: d.isoformat(), na_action="ignore"),
+        "is_current": is_current,
+        "duration_months": months_column(_column(frame, "duration")),
+    }, index=frame.index)
+
+    return [{**experience, **extra} for experience, extra in zip(experiences, _records(typed))]
+
+
+def normalize_batch(profiles):
+    # Pipeline stage between prepare_profile_for_db() and the database: typed
+    # profile columns plus typed fields on every entry of experience_json.
+    profiles = normalize_profiles(profiles)
+    experiences = normalize_experiences(
+        [experience for profile in profiles for experience in profile["experience_json"]]
+    )
+
+    start = 0
+    for profile in profiles:
+        end = start + len(profile["experience_json"])
+        profile["experience_json"] = experiences[start:end]
+        start = end
+    return profiles
+
+
+def canonical_profile_url(url):
+    # One spelling per profile: https://www.linkedin.com/in/<slug>/ with no
+    # query string, fragment, locale suffix or case differences.
+    url = (url or "").strip()
+    if url and "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    segments = [segment for segment in parts.path.split("/") if segment]
+    if len(segments) >= 2 and segments[0].lower() == "in":
+        return f"https://www.linkedin.com/in/{segments[1].lower()}/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, "", ""))
+
+
+def profile_key(url):
+    # Fixed-width key for a profile: SHA-1 hex of its canonical URL. Indexed in
+    # place of the TEXT profile_url and shared by the person, experience and
+    # skill tables.
+    return hashlib.sha1(canonical_profile_url(url).encode("utf-8")).hexdigest()
+
+
+FINGERPRINT_SECTIONS = ["basic", "experience", "skills"]
+# Left out of the basic info fingerprint: relative times like "2d" change between
+# visits without the profile changing, and the URL is the profile's key anyway.
+VOLATILE_FIELDS = {"last_activity", "profile_url"}
+
+
+def _digest(value):
+    encoded = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+
+def section_fingerprints(profile):
+    # Content hash per section of a scraped records.Profile, so a re-crawl can
+    # tell which sections (if any) differ from the stored capture.
+    basic = {
+        field: value for field, value in profile.basic_info().items()
+        if field not in VOLATILE_FIELDS
+    }
+    return {
+        "basic": _digest(basic),
+        "experience": _digest([entry.to_dict() for entry in profile.experience]),
+        "skills": _digest(profile.skills),
+    }
+
+
+def changed_sections(fingerprints, stored):
+    # stored: the fingerprints saved with the last capture, or None if the
+    # profile is new (then every section counts as changed).
+    if stored is None:
+        return list(FINGERPRINT_SECTIONS)
+    return [section for section in FINGERPRINT_SECTIONS if fingerprints[section] != stored.get(section)]
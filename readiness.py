@@ -0,0 +1,138 @@
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+import time
+
+
+# Seconds to wait for each stage of a profile page. The layout and the sections
+# are watched together, and the wait ends as soon as the page stops changing,
+# so these are upper bounds, not fixed costs: the layout wait gets its own
+# timeout plus the longest timeout of the sections asked for.
+SECTION_TIMEOUTS = {
+    "top_card": 15,
+    "layout": 6,
+    "About": 3,
+    "Activity": 3,
+    "Experience": 6,
+    "Skills": 4,
+    # Details pages: time for the first list item to render, and how long a
+    # scroll may take to add items before the list counts as complete.
+    "details_list": 10,
+    "details_settle": 2,
+}
+
+POLL_INTERVAL = 0.25
+# Number of consecutive polls a count has to stay the same to count as stable.
+STABLE_POLLS = 2
+
+TOP_CARD_XPATH = '//main/section[1]/div[2]/div[2]/div[1]/div[1]/span/a/h1'
+SECTION_XPATH = '//main/section'
+SECTION_ITEMS_XPATH = (
+    '//main/section[div[2]/div/div/div/h2/span[1][normalize-space()="{name}"]]/div[3]/ul/li'
+)
+
+# Upper bound on scroll rounds per details page; a few hundred items at most.
+MAX_SCROLLS = 40
+# Scrolls to the bottom and presses "Show more results" where the page has one,
+# in one round trip.
+SCROLL_SCRIPT = (
+    "window.scrollTo(0, document.body.scrollHeight);"
+    "var more = document.querySelector('main button.scaffold-finite-scroll__load-button');"
+    "if (more) { more.click(); }"
+)
+
+
+def _stable_page(sections, changed_at):
+    # One observation of the whole page per poll: the number of sections and
+    # the item count of every requested section (0 while absent). Ready once
+    # the observation has been the same for STABLE_POLLS polls in a row, so a
+    # page that is already rendered costs one poll interval, not one per
+    # section. changed_at records when each section's count last moved.
+    history = []
+    started = time.perf_counter()
+
+    def condition(driver):
+        observed = (len(driver.find_elements(By.XPATH, SECTION_XPATH)),) + tuple(
+            len(driver.find_elements(By.XPATH, SECTION_ITEMS_XPATH.format(name=name)))
+            for name in sections
+        )
+        if history and observed != history[-1]:
+            for name, before, now in zip(sections, history[-1][1:], observed[1:]):
+                if before != now:
+                    changed_at[name] = time.perf_counter() - started
+        history.append(observed)
+        if observed[0] == 0:
+            return False
+        recent = history[-STABLE_POLLS:]
+        return len(recent) == STABLE_POLLS and len(set(recent)) == 1
+
+    return condition
+
+
+def _wait(driver, condition, timeout):
+    started = time.perf_counter()
+    try:
+        WebDriverWait(
+            driver, timeout, poll_frequency=POLL_INTERVAL,
+            ignored_exceptions=(WebDriverException,)
+        ).until(condition)
+        ready = True
+    except TimeoutException:
+        ready = False
+    return ready, time.perf_counter() - started
+
+
+def wait_for_profile(driver, sections=("About", "Activity", "Experience", "Skills"), timeouts=None):
+    timeouts = {**SECTION_TIMEOUTS, **(timeouts or {})}
+    timings = {}
+
+    ready, timings["top_card"] = _wait(
+        driver, lambda d: d.find_elements(By.XPATH, TOP_CARD_XPATH), timeouts["top_card"]
+    )
+    if not ready:
+        return timings
+
+    # Lower sections are lazy-rendered; wait until neither the number of
+    # sections nor any requested section's items change any more.
+    changed_at = {name: 0.0 for name in sections}
+    _, timings["layout"] = _wait(
+        driver, _stable_page(sections, changed_at),
+        timeouts["layout"] + max((timeouts.get(name, timeouts["layout"]) for name in sections), default=0)
+    )
+    timings.update(changed_at)
+
+    return timings
+
+
+def wait_for_list(driver, items_xpath, timeouts=None):
+    timeouts = {**SECTION_TIMEOUTS, **(timeouts or {})}
+    return _wait(driver, lambda d: d.find_elements(By.XPATH, items_xpath), timeouts["details_list"])
+
+
+def scroll_until_stable(driver, items_xpath, timeouts=None, max_scrolls=MAX_SCROLLS):
+    # Lazy-loaded lists: scroll, wait for the item count to grow, repeat. Stops
+    # at the first scroll that adds nothing within details_settle seconds, so
+    # a complete list costs one settle wait. Returns (item count, scrolls).
+    timeouts = {**SECTION_TIMEOUTS, **(timeouts or {})}
+    count = len(driver.find_elements(By.XPATH, items_xpath))
+    scrolls = 0
+    while scrolls < max_scrolls:
+        driver.execute_script(SCROLL_SCRIPT)
+        scrolls += 1
+        seen = []
+
+        def grew(d):
+            seen.append(len(d.find_elements(By.XPATH, items_xpath)))
+            return seen[-1] > count
+
+        grown, _ = _wait(driver, grew, timeouts["details_settle"])
+        if not grown:
+            break
+        count = seen[-1]
+    return count, scrolls
+
+
+def wait_for_login(driver, timeout=300):
+    # The li_at cookie is only issued once the login has gone through.
+    ready, _ = _wait(driver, lambda d: d.get_cookie("li_at"), timeout)
+    return ready
@@ -0,0 +1,158 @@
+import json
+
+
+# Typed records for scraped profiles. The extraction functions in scraper.py
+# build these directly; a missing value is None rather than a "Not Found"
+# string. With __slots__ a record has no per-instance dict, so a batch takes
+# about a quarter less memory than the same profiles as nested dicts
+# (benchmarks/records_benchmark.py); the page text itself is the rest.
+#
+# Every consumer goes through the conversions below: to_dict() for the JSON
+# Lines export, flat_row() for the one-row-per-profile shape the database and
+# the CSV/Parquet exports use, and to_columns()/to_frame()/to_arrow() for
+# batches.
+
+# Written by older versions for a value that was not on the page.
+NOT_FOUND = "Not Found"
+
+EXPERIENCE_FIELDS = (
+    "job_title", "company_name", "company_link", "location", "work_mode",
+    "total_duration", "job_type", "duration", "tenurity"
+)
+BASIC_FIELDS = (
+    "name", "connections", "followers", "headline", "about", "last_activity",
+    "location", "profile_url"
+)
+
+# One row per profile: its basic info, its first (most recent) role and its
+# skills joined with ", ".
+FLAT_FIELDS = (
+    "name", "headline", "location", "connections", "followers", "about", "last_activity",
+    "profile_url", "job_title", "company_name", "company_link", "company_location",
+    "work_mode", "total_duration", "job_type", "duration", "tenurity", "skills"
+)
+
+
+def value_or_none(value):
+    if value is None or value == NOT_FOUND:
+        return None
+    return value
+
+
+class Experience:
+    __slots__ = EXPERIENCE_FIELDS
+
+    def __init__(self, job_title=None, company_name=None, company_link=None, location=None,
+                 work_mode=None, total_duration=None, job_type=None, duration=None, tenurity=None):
+        self.job_title = job_title
+        self.company_name = company_name
+        self.company_link = company_link
+        self.location = location
+        self.work_mode = work_mode
+        self.total_duration = total_duration
+        self.job_type = job_type
+        self.duration = duration
+        self.tenurity = tenurity
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: value_or_none(data.get(field)) for field in EXPERIENCE_FIELDS})
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in EXPERIENCE_FIELDS}
+
+    def __eq__(self, other):
+        return isinstance(other, Experience) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Experience({self.job_title!r}, {self.company_name!r})"
+
+
+class Profile:
+    __slots__ = BASIC_FIELDS + ("experience", "skills")
+
+    def __init__(self, name=None, connections=None, followers=None, headline=None, about=None,
+                 last_activity=None, location=None, profile_url=None, experience=None, skills=None):
+        self.name = name
+        self.connections = connections
+        self.followers = followers
+        self.headline = headline
+        self.about = about
+        self.last_activity = last_activity
+        self.location = location
+        self.profile_url = profile_url
+        self.experience = experience if experience is not None else []
+        self.skills = skills if skills is not None else []
+
+    @classmethod
+    def from_dict(cls, data):
+        # Reads the nested start_scrap() shape, as found in JSON Lines exports.
+        basic = data.get("basic_info", {})
+        return cls(
+            **{field: value_or_none(basic.get(field)) for field in BASIC_FIELDS},
+            experience=[Experience.from_dict(entry) for entry in data.get("experience") or []],
+            skills=[skill for skill in data.get("skills") or [] if value_or_none(skill)]
+        )
+
+    def basic_info(self):
+        return {field: getattr(self, field) for field in BASIC_FIELDS}
+
+    def to_dict(self):
+        return {
+            "basic_info": self.basic_info(),
+            "experience": [entry.to_dict() for entry in self.experience],
+            "skills": list(self.skills),
+        }
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def __eq__(self, other):
+        return isinstance(other, Profile) and self.to_dict() == other.to_dict()
+
+    def __repr__(self):
+        return f"Profile({self.name!r}, {self.profile_url!r})"
+
+
+def as_profile(data):
+    return data if isinstance(data, Profile) else Profile.from_dict(data)
+
+
+def flat_row(profile):
+    first = profile.experience[0] if profile.experience else Experience()
+    return {
+        "name": profile.name,
+        "headline": profile.headline,
+        "location": profile.location,
+        "connections": profile.connections,
+        "followers": profile.followers,
+        "about": profile.about,
+        "last_activity": profile.last_activity,
+        "profile_url": profile.profile_url,
+        "job_title": first.job_title,
+        "company_name": first.company_name,
+        "company_link": first.company_link,
+        "company_location": first.location,
+        "work_mode": first.work_mode,
+        "total_duration": first.total_duration,
+        "job_type": first.job_type,
+        "duration": first.duration,
+        "tenurity": first.tenurity,
+        "skills": ", ".join(profile.skills) if profile.skills else None,
+    }
+
+
+def to_columns(profiles):
+    # field -> list of values, one per profile; None where a value is missing.
+    rows = [flat_row(profile) for profile in profiles]
+    return {field: [row[field] for row in rows] for field in FLAT_FIELDS}
+
+
+def to_frame(profiles):
+    import pandas as pd
+    return pd.DataFrame(to_columns(profiles), columns=list(FLAT_FIELDS), dtype="string")
+
+
+def to_arrow(profiles):
+    import pyarrow as pa
+    return pa.table(to_columns(profiles), schema=pa.schema([(field, pa.string()) for field in FLAT_FIELDS]))
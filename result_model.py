@@ -0,0 +1,89 @@
+from collections import OrderedDict
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+# Rows are read from the search index a page at a time and only the last few
+# pages the view asked for stay in memory, so the list costs the same however
+# many profiles a session has scraped.
+PAGE_SIZE = 100
+CACHED_PAGES = 5
+
+
+def display_text(row):
+    text = f"{row['name']} — {row['headline']}" if row["headline"] else row["name"]
+    # Search hits also show where the query matched.
+    return f"{text}   {' '.join(row['snippet'].split())}" if row.get("snippet") else text
+
+
+# List model over every profile in a SearchIndex, oldest first, or over the
+# hits of a search while one is shown.
+class ProfileListModel(QAbstractListModel):
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.search_index = index
+        self.hits = None
+        self.rows = index.count()
+        self.pages = OrderedDict()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.rows
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.row(index.row())
+        if row is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            return display_text(row)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return "\n".join(filter(None, [row["location"], row["profile_url"]]))
+        if role == Qt.ItemDataRole.UserRole:
+            return row
+        return None
+
+    def row(self, position):
+        if self.hits is not None:
+            return self.hits[position] if position < len(self.hits) else None
+
+        number, offset = divmod(position, PAGE_SIZE)
+        page = self.pages.get(number)
+        if page is None:
+            page = self.search_index.page(number * PAGE_SIZE, PAGE_SIZE)
+            self.pages[number] = page
+            if len(self.pages) > CACHED_PAGES:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(number)
+        return page[offset] if offset < len(page) else None
+
+    def show_hits(self, hits):
+        self.beginResetModel()
+        self.hits = hits
+        self.rows = len(hits)
+        self.endResetModel()
+
+    def show_all(self):
+        self.beginResetModel()
+        self.hits = None
+        self.pages.clear()
+        self.rows = self.search_index.count()
+        self.endResetModel()
+
+    def profiles_indexed(self, added):
+        # Called after SearchIndex.add(); added is its return value. New
+        # profiles are more rows at the end, re-scraped ones change in place.
+        if self.hits is not None:
+            return
+        if added:
+            # The page the new rows start on was cached short; reread it.
+            self.pages.pop(self.rows // PAGE_SIZE, None)
+            self.beginInsertRows(QModelIndex(), self.rows, self.rows + added - 1)
+            self.rows += added
+            self.endInsertRows()
+        else:
+            self.pages.clear()
+            if self.rows:
+                self.dataChanged.emit(self.index(0), self.index(self.rows - 1))
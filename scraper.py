@@ -2,17 +2,15 @@ from selenium import webdriver
 from selenium.webdriver.common.by import By
 from time import time
 from itertools import chain
-import pandas as pd
-import json
 import time
-import os
 import re
 
-
-COOKIE_FILE = "linkedin_cookies.json"
-URL = "https://www.linkedin.com/"
-
-
+from metrics import inc, span
+from normalize import canonical_profile_url
+from readiness import scroll_until_stable, wait_for_list, wait_for_profile
+from records import Experience, Profile
+from snapshot import SnapshotDriver
+from throttle import raise_if_blocked
 
 
 job_types = [
@@ -34,67 +32,55 @@ work_modes = [
 ]
 
 
-def load_cookies(driver):
-    if os.path.exists(COOKIE_FILE):
-        with open(COOKIE_FILE, "r") as f:
-            cookies = json.load(f)
-        for cookie in cookies:
-            cookie.pop("sameSite", None)
-            driver.add_cookie(cookie)
-        driver.refresh()
-        print("[+] Cookies loaded, logged in!")
-    else:
-        print("[-] No cookies found. Please login manually...")
-        driver.get(URL+'login')
-        time.sleep(30) 
-        cookies = driver.get_cookies()
-        with open(COOKIE_FILE, "w") as f:
-            json.dump(cookies, f)
-        print("[+] Cookies saved for next time!")
-
-def find_section_index(driver,section_name):
-
-    index = 2
-    section_count = driver.find_elements(By.XPATH,'//main/section')
-
-    for index in range(2,len(section_count)):
-        section_tag = driver.find_element(By.XPATH,f'//main/section[{index}]/div[2]/div/div/div/h2/span[1]')
-        if not section_tag:
-            return -1
-        elif section_tag.text == section_name:
-            return index
-        index +=1
-    return -1
+def build_section_map(driver):
+    # One pass over the page: heading text -> position of its //main/section.
+    # Build it once per page load and pass it around; navigating away makes it stale.
+    sections = {}
+    section_elements = driver.find_elements(By.XPATH,'//main/section')
+
+    for index, section in enumerate(section_elements[1:], start=2):
+        heading = section.find_elements(By.XPATH,'./div[2]/div/div/div/h2/span[1]')
+        if heading:
+            sections.setdefault(heading[0].text.strip(), index)
+    return sections
+
+def find_section_index(driver,section_name,sections=None):
+    if sections is None:
+        sections = build_section_map(driver)
+    return sections.get(section_name)
+
+# LinkedIn style date patterns, compiled once; this runs for every nested role.
+LINKEDIN_DATES_PATTERN = re.compile(
+    r'\b('
+    r'(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|'
+    r'Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?)'
+    r'\s+(19|20)\d{2}'
+    r'|'  # OR year only like "2022"
+    r'(19|20)\d{2}'
+    r')\s*(–|-)\s*(Present|present|Current|current|'
+    r'(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|'
+    r'Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?'
+    r')\s+(19|20)\d{2})\b'
+)
 
 def find_linkedin_dates(text):
-    # LinkedIn style date patterns
-    pattern = re.compile(
-        r'\b('
-        r'(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|'
-        r'Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?)'
-        r'\s+(19|20)\d{2}'
-        r'|'  # OR year only like "2022"
-        r'(19|20)\d{2}'
-        r')\s*(–|-)\s*(Present|present|Current|current|'
-        r'(Jan(uary)?|Feb(ruary)?|Mar(ch)?|Apr(il)?|May|Jun(e)?|Jul(y)?|'
-        r'Aug(ust)?|Sep(t)?(ember)?|Oct(ober)?|Nov(ember)?|Dec(ember)?'
-        r')\s+(19|20)\d{2})\b'
-    )
-
-    return pattern.findall(text)
+    return LINKEDIN_DATES_PATTERN.findall(text)
 
 
 
-def get_basic_info(driver):
-    details = {}
+def get_basic_info(driver, sections=None):
+    # Returns a Profile with the top card, About and Activity filled in;
+    # start_scrap() adds the experience and skills.
+    if sections is None:
+        sections = build_section_map(driver)
 
     name = driver.find_element(By.XPATH,'//main/section[1]/div[2]/div[2]/div[1]/div[1]/span/a/h1').text
     connections_followers = driver.find_elements(By.XPATH,'//main/section[1]/div[2]/ul/li')
     head_line = driver.find_element(By.XPATH,'//main/section[1]/div[2]/div[2]/div[1]/div[2]').text
     location = driver.find_element(By.XPATH,'//main/section[1]/div[2]/div[2]/div[2]/span[1]').text
     
-    connections = "Not Found"
-    followers = 'Not Found'
+    connections = None
+    followers = None
     for ele in connections_followers:
         if ele.text.endswith('connections'):
             connections = ele.text
@@ -102,18 +88,18 @@ def get_basic_info(driver):
             followers = ele.text
 
 
-    about_index = find_section_index(driver,'About')
-    about = 'Not Found'
-    if  about_index != -1:
+    about_index = find_section_index(driver,'About',sections)
+    about = None
+    if  about_index is not None:
         about_ele = driver.find_element(By.XPATH,f'//main/section[{about_index}]/div[3]/div/div/div/span[1]')
         about = about_ele.text
 
     
 
-    activity_index = find_section_index(driver,'Activity')
-    last_activity = 'Not Found'
+    activity_index = find_section_index(driver,'Activity',sections)
+    last_activity = None
 
-    if activity_index != -1:
+    if activity_index is not None:
         post = driver.find_elements(
             By.XPATH,
             f'//main/section[{activity_index}]/div[4]/div/div/div[1]/div[2]/section/div[2]/div/ul/li[1]/div/div/div/div/div/div/div/div/div/div/span/span[2]'
@@ -129,42 +115,42 @@ def get_basic_info(driver):
             if comment:
                 last_activity = comment[0].text 
 
-        if followers == 'Not Found':
+        if followers is None:
             followers = driver.find_element(By.XPATH,f'//main/section[{activity_index}]/div[2]/div/div/div/p/span[1]').text
 
-    details['name'] = name
-    details['connections'] = connections
-    details['followers'] = followers
-    details['headline'] = head_line
-    details['about'] = about
-    details['last_activity'] = last_activity
-    details['location'] = location
-    details['profile_url'] = driver.current_url
-
-    return details
+    return Profile(
+        name=name,
+        connections=connections,
+        followers=followers,
+        headline=head_line,
+        about=about,
+        last_activity=last_activity,
+        location=location,
+        profile_url=driver.current_url
+    )
 
 
-def extract_nested(driver,section_count,index):
+def extract_nested(driver,item):
     
     experiences = []
     
-    company_name = driver.find_element(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/div/div/div/div/span[1]').text.strip()
+    company_name = driver.find_element(By.XPATH,f'{item}/div/div[2]/div[1]/a/div/div/div/div/span[1]').text.strip()
     
-    company_link = driver.find_element(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[1]/a').get_attribute('href')
+    company_link = driver.find_element(By.XPATH,f'{item}/div/div[1]/a').get_attribute('href')
 
-    duration_ele = driver.find_elements(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/span/span[1]')
-    location_ele = driver.find_elements(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/span[2]/span[1]')
+    duration_ele = driver.find_elements(By.XPATH,f'{item}/div/div[2]/div[1]/a/span/span[1]')
+    location_ele = driver.find_elements(By.XPATH,f'{item}/div/div[2]/div[1]/a/span[2]/span[1]')
     
-    job_title = "Not Found"
+    job_title = None
 
-    work_mode = 'Not Found'
-    location = 'Not Found'
+    work_mode = None
+    location = None
 
-    total_duration = 'Not Found'
-    job_type = 'Not Found'
+    total_duration = None
+    job_type = None
     
-    duration = 'Not Found'
-    tenurity = 'Not Found'
+    duration = None
+    tenurity = None
 
     if location_ele:
         if '·' in location_ele[0].text:
@@ -173,9 +159,9 @@ def extract_nested(driver,section_count,index):
         else:
             if location_ele[0].text in work_modes:
                 work_mode = location_ele[0].text.strip()
-                location = 'Not Found'
+                location = None
             else:
-                work_mode = 'Not Found'
+                work_mode = None
                 location = location_ele[0].text.strip()
 
     if duration_ele:
@@ -185,24 +171,24 @@ def extract_nested(driver,section_count,index):
         else:
             if duration_ele[0].text in job_types:
                 job_type = duration_ele[0].text.strip()
-                total_duration = 'Not Found'
+                total_duration = None
             else:
-                job_type = 'Not Found'
+                job_type = None
                 total_duration = duration_ele[0].text.strip()
     
     
-    nested_count = driver.find_elements(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[2]/ul/li')
+    nested_count = driver.find_elements(By.XPATH,f'{item}/div/div[2]/div[2]/ul/li')
 
     
     for nested_index in range(1,len(nested_count)+1):
         
         
-        span_ele = driver.find_elements(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[2]/ul/li[{nested_index}]/div/div[2]/div[1]/a/span')
+        span_ele = driver.find_elements(By.XPATH,f'{item}/div/div[2]/div[2]/ul/li[{nested_index}]/div/div[2]/div[1]/a/span')
         
         for span_index in range(1,len(span_ele)+1):
-            ele = driver.find_element(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[2]/ul/li[{nested_index}]/div/div[2]/div[1]/a/span[{span_index}]/span[1]')
+            ele = driver.find_element(By.XPATH,f'{item}/div/div[2]/div[2]/ul/li[{nested_index}]/div/div[2]/div[1]/a/span[{span_index}]/span[1]')
             
-            job_title = driver.find_element(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[2]/ul/li[{nested_index}]/div/div[2]/div[1]/a/div/div/div/div/span[1]').text.strip()
+            job_title = driver.find_element(By.XPATH,f'{item}/div/div[2]/div[2]/ul/li[{nested_index}]/div/div[2]/div[1]/a/div/div/div/div/span[1]').text.strip()
             
             if find_linkedin_dates(ele.text):
                 if '·' in ele.text:
@@ -221,37 +207,38 @@ def extract_nested(driver,section_count,index):
         
        
 
-        experiences.append({
-            'job_title':job_title,
-            'company_name':company_name,
-            'company_link':company_link,
-            'location':location,
-            'work_mode':work_mode,
-            'total_duration':total_duration,
-            'job_type':job_type,
-            'duration':duration,
-            'tenurity':tenurity
-        })
+        experiences.append(Experience(
+            job_title=job_title,
+            company_name=company_name,
+            company_link=company_link,
+            location=location,
+            work_mode=work_mode,
+            total_duration=total_duration,
+            job_type=job_type,
+            duration=duration,
+            tenurity=tenurity
+        ))
     return experiences
 
 
-def extract_single(driver,section_count,index):
-    
+def _strip(text):
+    return text.strip() if text is not None else None
 
-    experience = {}
 
+def extract_single(driver,item):
+    
     job_title_elements = driver.find_elements(
-    By.XPATH, f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/div/div/div/div/span[1]')
+    By.XPATH, f'{item}/div/div[2]/div[1]/a/div/div/div/div/span[1]')
 
-    job_title = job_title_elements[0].text if job_title_elements else "Not Found"
-    company_link = driver.find_element(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[1]/a').get_attribute('href')
+    job_title = job_title_elements[0].text if job_title_elements else None
+    company_link = driver.find_element(By.XPATH,f'{item}/div/div[1]/a').get_attribute('href')
     company_elements = driver.find_elements(
-        By.XPATH, f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/span[1]/span[1]'
+        By.XPATH, f'{item}/div/div[2]/div[1]/a/span[1]/span[1]'
     )
-    company_name = "Not Found"
-    job_type = "Not Found"
+    company_name = None
+    job_type = None
 
-    company_name_job_type = company_elements[0].text if company_elements else "Not Found"
+    company_name_job_type = company_elements[0].text if company_elements else ""
     if len(company_name_job_type.split('·')) > 1:
         company_name = company_name_job_type.split('·')[0]
         job_type = company_name_job_type.split('·')[1]
@@ -264,19 +251,19 @@ def extract_single(driver,section_count,index):
         
 
     tenure_elements = driver.find_elements(
-        By.XPATH, f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/span[2]/span[1]'
+        By.XPATH, f'{item}/div/div[2]/div[1]/a/span[2]/span[1]'
     )
-    tenure = tenure_elements[0].text if tenure_elements else "Not Found"
+    tenure = tenure_elements[0].text if tenure_elements else ""
 
-    tenurity = tenure.split('·')[0] if '·' in tenure else 'Not Found'
-    duration = tenure.split('·')[1] if '·' in tenure else 'Not Found'
+    tenurity = tenure.split('·')[0] if '·' in tenure else None
+    duration = tenure.split('·')[1] if '·' in tenure else None
 
     location_elements = driver.find_elements(
-        By.XPATH, f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[1]/a/span[3]/span[1]'
+        By.XPATH, f'{item}/div/div[2]/div[1]/a/span[3]/span[1]'
     )
-    location = location_elements[0].text if location_elements else 'Not Found'
+    location = location_elements[0].text if location_elements else None
 
-    work_mode = 'Not Found'
+    work_mode = None
 
     if location_elements:
         if '·' in location_elements[0].text.strip():
@@ -291,42 +278,43 @@ def extract_single(driver,section_count,index):
         else:
             if location_elements[0].text in work_modes:
                 work_mode = location_elements[0].text
-                location = 'Not Found'
+                location = None
             else:
                 location = location_elements[0].text
-                work_mode = 'Not Found'
-
-
-    experience['job_title'] = job_title.strip()
-    experience['company_link'] = company_link
-    experience['company_name'] = company_name.strip()
-    experience['job_type'] = job_type.strip()
-    experience['tenurity'] = tenurity.strip() 
-    experience['duration'] = duration.strip() 
-    experience['location'] = location.strip()
-    experience['work_mode'] = work_mode.strip()
-
-
-    return experience 
+                work_mode = None
+
+
+    return Experience(
+        job_title=_strip(job_title),
+        company_link=company_link,
+        company_name=_strip(company_name),
+        job_type=_strip(job_type),
+        tenurity=_strip(tenurity),
+        duration=_strip(duration),
+        location=_strip(location),
+        work_mode=_strip(work_mode)
+    )
 
 
 
-def get_experience(driver):
+# List items of a section on the profile page, and of the list on a details
+# page (/details/experience/, /details/skills/). The entries inside an item have
+# the same markup in both, so the extract_* functions take the item's XPath.
+SECTION_ITEMS_XPATH = '//main/section[{index}]/div[3]/ul/li'
+DETAILS_ITEMS_XPATH = '//main/section/div[2]/div/div[1]/ul/li'
 
-    time.sleep(4)
 
+def parse_experience_items(driver, items_xpath):
     experiences = []
-
-    section_count = find_section_index(driver,'Experience')
-
-    total_experience = driver.find_elements(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li')
+    total_experience = driver.find_elements(By.XPATH, items_xpath)
 
     for index in range(1,len(total_experience)+1):
-        check_nested = bool(driver.find_elements(By.XPATH, f'//main/section[{section_count}]/div[3]/ul/li[{index}]/div/div[2]/div[2]/ul/li[1]/span'))
+        item = f'{items_xpath}[{index}]'
+        check_nested = bool(driver.find_elements(By.XPATH, f'{item}/div/div[2]/div[2]/ul/li[1]/span'))
         if check_nested:
-            experiences.append(extract_nested(driver,section_count,index))
+            experiences.append(extract_nested(driver,item))
         else:
-            experiences.append(extract_single(driver,section_count,index))
+            experiences.append(extract_single(driver,item))
     
     flattened = list(chain.from_iterable(
         item if isinstance(item, list) else [item]
@@ -335,32 +323,106 @@ def get_experience(driver):
     
     return flattened
 
-def get_skills(driver):
-    skills = []
-    section_count = find_section_index(driver,  'Skills')
-    skills_ele = driver.find_elements(By.XPATH,f'//main/section[{section_count}]/div[3]/ul/li/div/div[2]/div[1]/a/div/div/div/div/span[1]')
 
-    for ele in skills_ele:
-        skills.append(ele.text.strip())
-    
-    return skills
+def parse_skill_items(driver, items_xpath):
+    skills_ele = driver.find_elements(By.XPATH,f'{items_xpath}/div/div[2]/div[1]/a/div/div/div/div/span[1]')
+    return [ele.text.strip() for ele in skills_ele]
 
-    
-    
-    
 
+def get_experience(driver, sections=None):
+    section_count = find_section_index(driver,'Experience',sections)
+    if section_count is None:
+        return []
+    return parse_experience_items(driver, SECTION_ITEMS_XPATH.format(index=section_count))
 
+def get_skills(driver, sections=None):
+    section_count = find_section_index(driver,  'Skills', sections)
+    if section_count is None:
+        return []
+    return parse_skill_items(driver, SECTION_ITEMS_XPATH.format(index=section_count))
 
-def start_scrap(driver,profile_url):    
-    
-    # load_cookies(driver)
-    driver.get(profile_url)
 
-    basic_info = get_basic_info(driver)   
-    experience = get_experience(driver)
-    skkills = get_skills(driver)
+# Deep mode: the profile page shows only the first few roles and skills, and
+# hides roles nested under a company behind "Show all". Their details pages
+# list everything, lazy-loaded as the page scrolls.
+DETAILS_PAGES = [
+    # (field, profile section, details page, parser)
+    ("experience", "Experience", "details/experience/", parse_experience_items),
+    ("skills", "Skills", "details/skills/", parse_skill_items),
+]
+
 
-    return {'basic_info':basic_info,'experience':experience,'skills':skkills}
+def get_details(driver, profile_url, page, parse, snapshot=False, timeouts=None, timings=None):
+    # Opens a details page, scrolls until its list stops growing and parses it.
+    # Returns None when no list rendered, so the caller keeps what the profile
+    # page showed.
+    started = time.perf_counter()
+    driver.get(canonical_profile_url(profile_url) + page)
+    found, _ = wait_for_list(driver, DETAILS_ITEMS_XPATH, timeouts=timeouts)
+    if not found:
+        raise_if_blocked(driver)
+        return None
+    count, scrolls = scroll_until_stable(driver, DETAILS_ITEMS_XPATH, timeouts=timeouts)
+    if snapshot:
+        driver = SnapshotDriver.capture(driver)
+    items = parse(driver, DETAILS_ITEMS_XPATH)
+
+    name = page.strip("/").replace("/", "_")
+    inc("details_scrolls_total", scrolls, page=name)
+    if timings is not None:
+        timings[name] = time.perf_counter() - started
+        timings[f"{name}_scrolls"] = scrolls
+        timings[f"{name}_items"] = count
+    return items
+
+
+
+def start_scrap(driver,profile_url,snapshot=False,deep=False,timeouts=None,timings=None,acquire=None):
+    # deep: also read the full experience and skills lists from the details
+    # pages. Two more page loads per profile.
+    # acquire: called before each details page load, e.g. the throttle's
+    # acquire(), so those loads are paced and budgeted like the profile's.
+    with span("navigation"):
+        driver.get(profile_url)
+
+    # Sections keep rendering after load, so wait for them before mapping.
+    with span("readiness"):
+        wait_timings = wait_for_profile(driver, timeouts=timeouts)
+    if timings is not None:
+        timings.update({f"wait_{name}": seconds for name, seconds in wait_timings.items()})
+    if "layout" not in wait_timings:
+        # The top card never rendered: usually a rate-limit, checkpoint or login
+        # page rather than a profile, which the XPaths below would choke on.
+        raise_if_blocked(driver)
+    live = driver
+    if snapshot:
+        # Parse one page_source capture in-process instead of issuing a
+        # WebDriver call per XPath.
+        with span("snapshot_capture"):
+            driver = SnapshotDriver.capture(driver)
+
+    with span("build_section_map"):
+        sections = build_section_map(driver)
+
+    with span("get_basic_info"):
+        profile = get_basic_info(driver, sections)
+    with span("get_experience"):
+        profile.experience = get_experience(driver, sections=sections)
+    with span("get_skills"):
+        profile.skills = get_skills(driver, sections)
+
+    if deep:
+        for field, section, page, parse in DETAILS_PAGES:
+            if section not in sections:
+                continue
+            if acquire:
+                acquire()
+            with span(f"details_{field}"):
+                items = get_details(live, profile.profile_url, page, parse, snapshot, timeouts, timings)
+            if items is not None:
+                setattr(profile, field, items)
+
+    return profile
 
 
 
@@ -0,0 +1,247 @@
+from contextlib import contextmanager
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+
+from normalize import canonical_profile_url, profile_key
+from records import as_profile
+
+
+SEARCH_INDEX_FILE = os.environ.get("LI_SEARCH_INDEX", "profile_search.sqlite3")
+SEARCH_LIMIT = 20
+
+# FTS5 columns, in order, with their bm25 weight: a match in a name or headline
+# ranks well above the same word somewhere in the about text.
+SEARCH_COLUMNS = [
+    ("name", 10.0),
+    ("headline", 5.0),
+    ("job_titles", 4.0),
+    ("companies", 3.0),
+    ("skills", 3.0),
+    ("location", 1.5),
+    ("about", 1.0),
+]
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS profiles (
+    id INTEGER PRIMARY KEY,
+    profile_key TEXT NOT NULL UNIQUE,
+    profile_url TEXT NOT NULL,
+    name TEXT NOT NULL,
+    headline TEXT NOT NULL,
+    location TEXT NOT NULL,
+    captured_at REAL NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS profile_fts USING fts5(
+    {", ".join(column for column, _ in SEARCH_COLUMNS)},
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+"""
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def _text(value):
+    return "" if value is None else str(value)
+
+
+def search_fields(profile):
+    # Flattens a records.Profile into the indexed columns.
+    return {
+        "name": _text(profile.name),
+        "headline": _text(profile.headline),
+        "job_titles": "\n".join(_text(entry.job_title) for entry in profile.experience),
+        "companies": "\n".join(_text(entry.company_name) for entry in profile.experience),
+        "skills": "\n".join(profile.skills),
+        "location": _text(profile.location),
+        "about": _text(profile.about),
+    }
+
+
+def build_query(text):
+    # Free text to an FTS5 query: every word must match, the last one as a
+    # prefix so results update while typing. Words are quoted, so operators and
+    # punctuation in the input are treated as plain text.
+    words = TOKEN_PATTERN.findall(text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+# Local full-text index of scraped profiles in a SQLite file. One row per
+# profile (keyed like li_person_master): indexing a profile again replaces it.
+class SearchIndex:
+
+    def __init__(self, path=SEARCH_INDEX_FILE):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connection()
+        conn.executescript(SCHEMA)
+        # Stored in the index, so ORDER BY rank uses the weighted bm25.
+        weights = ", ".join(str(weight) for _, weight in SEARCH_COLUMNS)
+        conn.execute("INSERT INTO profile_fts (profile_fts, rank) VALUES ('rank', ?)", (f"bm25({weights})",))
+
+    def _connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def add(self, profile, captured_at=None):
+        return self.add_many([profile], captured_at)
+
+    def add_many(self, profiles, captured_at=None):
+        # Returns how many of the profiles were new to the index. Accepts
+        # records.Profile or the nested dicts of a JSON Lines export.
+        captured_at = captured_at or time.time()
+        with self._transaction() as conn:
+            return sum(self._upsert(conn, as_profile(profile), captured_at) for profile in profiles)
+
+    def _upsert(self, conn, profile, captured_at):
+        url = profile.profile_url or ""
+        fields = search_fields(profile)
+        key = profile_key(url)
+
+        row = conn.execute("SELECT id FROM profiles WHERE profile_key = ?", (key,)).fetchone()
+        if row:
+            rowid = row[0]
+            conn.execute(
+                "UPDATE profiles SET profile_url = ?, name = ?, headline = ?, location = ?, "
+                "captured_at = ? WHERE id = ?",
+                (canonical_profile_url(url), fields["name"], fields["headline"],
+                 fields["location"], captured_at, rowid)
+            )
+            conn.execute("DELETE FROM profile_fts WHERE rowid = ?", (rowid,))
+            new = False
+        else:
+            rowid = conn.execute(
+                "INSERT INTO profiles (profile_key, profile_url, name, headline, location, captured_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, canonical_profile_url(url), fields["name"], fields["headline"],
+                 fields["location"], captured_at)
+            ).lastrowid
+            new = True
+
+        columns = [column for column, _ in SEARCH_COLUMNS]
+        conn.execute(
+            f"INSERT INTO profile_fts (rowid, {', '.join(columns)}) "
+            f"VALUES (?, {', '.join(['?'] * len(columns))})",
+            [rowid] + [fields[column] for column in columns]
+        )
+        return new
+
+    def search(self, text, limit=SEARCH_LIMIT):
+        # Best matches first. score is bm25 with the column weights above;
+        # lower is better, as in SQLite.
+        query = build_query(text)
+        if query is None:
+            return []
+        rows = self._connection().execute(
+            "SELECT p.profile_key, p.profile_url, p.name, p.headline, p.location, m.snippet, m.rank "
+            "FROM (SELECT rowid, snippet(profile_fts, -1, '[', ']', '…', 8) AS snippet, rank "
+            "      FROM profile_fts WHERE profile_fts MATCH ? ORDER BY rank LIMIT ?) m "
+            "JOIN profiles p ON p.id = m.rowid ORDER BY m.rank",
+            (query, limit)
+        ).fetchall()
+        return [
+            {
+                "profile_key": key,
+                "profile_url": url,
+                "name": name,
+                "headline": headline,
+                "location": location,
+                "snippet": snippet,
+                "score": score,
+            }
+            for key, url, name, headline, location, snippet, score in rows
+        ]
+
+    def page(self, offset, limit):
+        # Profiles in the order they were first indexed; a re-indexed profile
+        # keeps its place. Backs the GUI's results list one page at a time.
+        rows = self._connection().execute(
+            "SELECT profile_key, profile_url, name, headline, location, captured_at "
+            "FROM profiles ORDER BY id LIMIT ? OFFSET ?",
+            (limit, offset)
+        ).fetchall()
+        return [
+            {
+                "profile_key": key,
+                "profile_url": url,
+                "name": name,
+                "headline": headline,
+                "location": location,
+                "captured_at": captured_at,
+            }
+            for key, url, name, headline, location, captured_at in rows
+        ]
+
+    def match_count(self, text):
+        query = build_query(text)
+        if query is None:
+            return 0
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM profile_fts WHERE profile_fts MATCH ?", (query,)
+        ).fetchone()[0]
+
+    def count(self):
+        return self._connection().execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+    def optimize(self):
+        # Merges the FTS segments written by incremental updates.
+        self._connection().execute("INSERT INTO profile_fts (profile_fts) VALUES ('optimize')")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query or fill the local profile search index.")
+    parser.add_argument("query", nargs="?", help="words to search for")
+    parser.add_argument("-i", "--index", default=SEARCH_INDEX_FILE,
+                        help=f"index file (default {SEARCH_INDEX_FILE})")
+    parser.add_argument("--add", metavar="JSONL", action="append", default=[],
+                        help="index the results in this JSONL export (repeatable)")
+    parser.add_argument("-n", "--limit", type=int, default=SEARCH_LIMIT)
+    args = parser.parse_args(argv)
+
+    index = SearchIndex(args.index)
+    for path in args.add:
+        with open(path, encoding="utf-8") as f:
+            results = [json.loads(line) for line in f if line.strip()]
+        added = index.add_many(results)
+        print(f"[+] Indexed {len(results)} profiles from {path} ({added} new)")
+    if args.add:
+        index.optimize()
+
+    if args.query:
+        started = time.perf_counter()
+        hits = index.search(args.query, args.limit)
+        elapsed = (time.perf_counter() - started) * 1000
+        for hit in hits:
+            print(f"{hit['score']:8.2f}  {hit['name']} — {hit['headline']}\n          {hit['profile_url']}")
+        print(f"{len(hits)} results of {index.count()} profiles in {elapsed:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
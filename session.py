@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import time
+
+from readiness import wait_for_login
+from throttle import blocked_url_kind
+
+
+# LinkedIn session handling. Each browser of the pool runs on its own Chrome
+# profile directory (Chrome locks a profile to one process), so a login
+# survives restarts and browser recycling without touching the cookie store.
+# COOKIE_FILE is the fallback: it seeds new profile directories and is
+# refreshed every time a session checks out.
+#
+# Startup costs one /feed/ load per browser to confirm the session; only when
+# neither the profile nor the saved cookies are logged in does anyone have to
+# log in by hand.
+
+URL = "https://www.linkedin.com/"
+FEED_URL = URL + "feed/"
+LOGIN_URL = URL + "login"
+COOKIE_FILE = os.environ.get("LI_COOKIE_FILE", "linkedin_cookies.json")
+# Parent of the per-slot Chrome profiles; empty to use throwaway profiles.
+PROFILE_DIR = os.environ.get("LI_PROFILE_DIR", "browser_profiles")
+
+
+class LoginRequiredError(RuntimeError):
+    pass
+
+
+def profile_path(slot, base=PROFILE_DIR):
+    if not base or slot is None:
+        return None
+    return os.path.abspath(os.path.join(base, f"slot-{slot}"))
+
+
+def load_cookies(driver, path=COOKIE_FILE):
+    # The browser has to be on a linkedin.com page for the cookies to apply.
+    if not os.path.exists(path):
+        return False
+    with open(path, "r") as f:
+        cookies = json.load(f)
+    for cookie in cookies:
+        cookie.pop("sameSite", None)
+        driver.add_cookie(cookie)
+    return True
+
+
+def save_cookies(driver, path=COOKIE_FILE):
+    # Written to a temporary file first: several browsers may save at once.
+    cookies = driver.get_cookies()
+    temporary = f"{path}.{os.getpid()}.{id(driver)}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(cookies, f)
+    os.replace(temporary, path)
+
+
+def session_valid(driver):
+    # Checks the page the browser is on, without navigating: logged out,
+    # authwall and checkpoint pages all live under known URLs, and li_at is
+    # only set for a logged-in session.
+    if blocked_url_kind(driver.current_url):
+        return False
+    return driver.get_cookie("li_at") is not None
+
+
+def ensure_session(driver, cookie_file=COOKIE_FILE):
+    # Opens the feed and returns whether the browser is logged in, trying the
+    # profile directory's own session first and the saved cookies second.
+    started = time.perf_counter()
+    driver.get(FEED_URL)
+    source = "browser profile"
+    if not session_valid(driver) and load_cookies(driver, cookie_file):
+        driver.get(FEED_URL)
+        source = "saved cookies"
+
+    if not session_valid(driver):
+        print(f"[-] Not logged in to LinkedIn ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+        return False
+    save_cookies(driver, cookie_file)
+    print(f"[+] Logged in from {source} ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+    return True
+
+
+def login_interactively(driver, timeout=300, cookie_file=COOKIE_FILE):
+    # Needs a visible browser and a person to type the credentials.
+    driver.get(LOGIN_URL)
+    print(f"[-] Log in to LinkedIn in the browser window (waiting up to {timeout}s)...", file=sys.stderr)
+    if not wait_for_login(driver, timeout):
+        raise LoginRequiredError("LinkedIn login was not completed in time")
+    save_cookies(driver, cookie_file)
+    print("[+] Logged in, session saved", file=sys.stderr)
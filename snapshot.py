@@ -0,0 +1,101 @@
+from selenium.common.exceptions import NoSuchElementException
+from selenium.webdriver.common.by import By
+import lxml.html
+import re
+
+
+# Elements LinkedIn renders only for screen readers; Selenium's .text skips them
+# because they are not visible, so the snapshot has to skip them too.
+HIDDEN_CLASSES = {"visually-hidden"}
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+
+_whitespace = re.compile(r"[ \t\r\f\v]+")
+
+
+def _is_hidden(node):
+    if node.get("hidden") is not None:
+        return True
+    classes = node.get("class")
+    if classes and HIDDEN_CLASSES.intersection(classes.split()):
+        return True
+    style = node.get("style", "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def _visible_text(node):
+    parts = []
+
+    def walk(el):
+        if not isinstance(el.tag, str) or el.tag in SKIP_TAGS or _is_hidden(el):
+            if el.tail and el is not node:
+                parts.append(el.tail)
+            return
+        if el.tag == "br":
+            parts.append("\n")
+        if el.text:
+            parts.append(el.text)
+        for child in el:
+            walk(child)
+        if el.tag in ("p", "div", "li") and el is not node:
+            parts.append("\n")
+        if el.tail and el is not node:
+            parts.append(el.tail)
+
+    walk(node)
+    lines = (_whitespace.sub(" ", line).strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+class SnapshotElement:
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def text(self):
+        return _visible_text(self._node)
+
+    def get_attribute(self, name):
+        return self._node.get(name)
+
+    def find_element(self, by=By.XPATH, value=None):
+        return _find_element(self._node, by, value)
+
+    def find_elements(self, by=By.XPATH, value=None):
+        return _find_elements(self._node, by, value)
+
+
+# Read-only stand-in for a WebDriver, backed by one page_source capture. It
+# supports the subset of the WebDriver API the scraper uses, so the parsing
+# functions in scraper.py run unchanged against an in-process lxml tree.
+class SnapshotDriver:
+
+    def __init__(self, page_source, current_url):
+        self.current_url = current_url
+        self.page_source = page_source
+        self._root = lxml.html.fromstring(page_source, base_url=current_url)
+        # Selenium returns resolved hrefs, so resolve them once up front.
+        self._root.make_links_absolute(current_url, resolve_base_href=True)
+
+    @classmethod
+    def capture(cls, driver):
+        return cls(driver.page_source, driver.current_url)
+
+    def find_element(self, by=By.XPATH, value=None):
+        return _find_element(self._root, by, value)
+
+    def find_elements(self, by=By.XPATH, value=None):
+        return _find_elements(self._root, by, value)
+
+
+def _find_elements(node, by, value):
+    if by != By.XPATH:
+        raise ValueError(f"Snapshot mode only supports XPath lookups, got {by!r}")
+    return [SnapshotElement(match) for match in node.xpath(value) if isinstance(getattr(match, "tag", None), str)]
+
+
+def _find_element(node, by, value):
+    matches = _find_elements(node, by, value)
+    if not matches:
+        raise NoSuchElementException(f"Unable to locate element: {value}")
+    return matches[0]
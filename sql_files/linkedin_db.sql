@@ -29,8 +29,9 @@ SET time_zone = "+00:00";
 
 CREATE TABLE `li_person` (
   `task_id` varchar(30) NOT NULL,
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
   `name` varchar(50) NOT NULL,
-  `headline` varchar(150) NOT NULL,
+  `headline` varchar(255) NOT NULL,
   `location` varchar(150) NOT NULL,
   `connections` varchar(20) NOT NULL,
   `last_activity` varchar(20) NOT NULL,
@@ -45,6 +46,17 @@ CREATE TABLE `li_person` (
   `tenurity` varchar(50) NOT NULL,
   `skills` text NOT NULL,
   `experience_json` text NOT NULL,
+  `connections_count` int(11) DEFAULT NULL,
+  `followers_count` int(11) DEFAULT NULL,
+  `start_date` date DEFAULT NULL,
+  `end_date` date DEFAULT NULL,
+  `is_current` tinyint(1) DEFAULT NULL,
+  `duration_months` smallint(6) DEFAULT NULL,
+  `total_duration_months` smallint(6) DEFAULT NULL,
+  `fingerprint_basic` char(40) CHARACTER SET ascii DEFAULT NULL,
+  `fingerprint_experience` char(40) CHARACTER SET ascii DEFAULT NULL,
+  `fingerprint_skills` char(40) CHARACTER SET ascii DEFAULT NULL,
+  `changed_sections` set('basic','experience','skills') NOT NULL DEFAULT '',
   `inserted_at` timestamp NOT NULL DEFAULT current_timestamp()
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
@@ -56,8 +68,9 @@ CREATE TABLE `li_person` (
 
 CREATE TABLE `li_person_master` (
   `task_id` varchar(30) NOT NULL,
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
   `name` varchar(50) NOT NULL,
-  `headline` varchar(150) NOT NULL,
+  `headline` varchar(255) NOT NULL,
   `location` varchar(150) NOT NULL,
   `connections` varchar(20) NOT NULL,
   `last_activity` varchar(20) NOT NULL,
@@ -72,7 +85,77 @@ CREATE TABLE `li_person_master` (
   `tenurity` varchar(50) NOT NULL,
   `skills` text NOT NULL,
   `experience_json` text NOT NULL,
+  `connections_count` int(11) DEFAULT NULL,
+  `followers_count` int(11) DEFAULT NULL,
+  `start_date` date DEFAULT NULL,
+  `end_date` date DEFAULT NULL,
+  `is_current` tinyint(1) DEFAULT NULL,
+  `duration_months` smallint(6) DEFAULT NULL,
+  `total_duration_months` smallint(6) DEFAULT NULL,
+  `fingerprint_basic` char(40) CHARACTER SET ascii DEFAULT NULL,
+  `fingerprint_experience` char(40) CHARACTER SET ascii DEFAULT NULL,
+  `fingerprint_skills` char(40) CHARACTER SET ascii DEFAULT NULL,
+  `changed_sections` set('basic','experience','skills') NOT NULL DEFAULT '',
   `inserted_at` timestamp NOT NULL DEFAULT current_timestamp(),
+  `updated_at` timestamp NULL DEFAULT NULL,
+  `last_seen_at` timestamp NULL DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `li_experience`
+--
+
+CREATE TABLE `li_experience` (
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  `position` smallint(6) NOT NULL,
+  `task_id` varchar(30) NOT NULL,
+  `job_title` varchar(100) NOT NULL,
+  `company_name` varchar(120) NOT NULL,
+  `company_link` text NOT NULL,
+  `location` varchar(150) NOT NULL,
+  `work_mode` varchar(50) NOT NULL,
+  `job_type` varchar(50) NOT NULL,
+  `total_duration` varchar(50) NOT NULL,
+  `duration` varchar(50) NOT NULL,
+  `tenurity` varchar(50) NOT NULL,
+  `start_date` date DEFAULT NULL,
+  `end_date` date DEFAULT NULL,
+  `is_current` tinyint(1) DEFAULT NULL,
+  `duration_months` smallint(6) DEFAULT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `li_skill`
+--
+
+CREATE TABLE `li_skill` (
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  `position` smallint(6) NOT NULL,
+  `task_id` varchar(30) NOT NULL,
+  `skill` varchar(150) NOT NULL
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+-- --------------------------------------------------------
+
+--
+-- Table structure for table `scrape_jobs`
+--
+
+CREATE TABLE `scrape_jobs` (
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  `profile_url` varchar(255) NOT NULL,
+  `source_url` text NOT NULL,
+  `state` enum('pending','running','done','failed') NOT NULL DEFAULT 'pending',
+  `attempts` tinyint(4) NOT NULL DEFAULT 0,
+  `lease_owner` varchar(100) DEFAULT NULL,
+  `claim_token` char(32) CHARACTER SET ascii DEFAULT NULL,
+  `lease_expires` datetime DEFAULT NULL,
+  `last_error` text DEFAULT NULL,
+  `created_at` timestamp(3) NOT NULL DEFAULT current_timestamp(3),
   `updated_at` timestamp NULL DEFAULT NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 
@@ -85,15 +168,43 @@ CREATE TABLE `li_person_master` (
 --
 ALTER TABLE `li_person`
   ADD PRIMARY KEY (`task_id`),
-  ADD KEY `task_id` (`task_id`);
+  ADD KEY `task_id` (`task_id`),
+  ADD KEY `profile_key` (`profile_key`);
 
 --
 -- Indexes for table `li_person_master`
 --
 ALTER TABLE `li_person_master`
-  ADD PRIMARY KEY (`task_id`),
-  ADD UNIQUE KEY `person_link` (`profile_url`) USING HASH,
-  ADD KEY `task_id` (`task_id`);
+  ADD PRIMARY KEY (`profile_key`),
+  ADD KEY `task_id` (`task_id`),
+  ADD KEY `start_date` (`start_date`),
+  ADD KEY `connections_count` (`connections_count`);
+
+--
+-- Indexes for table `li_experience`
+--
+ALTER TABLE `li_experience`
+  ADD PRIMARY KEY (`profile_key`,`position`),
+  ADD KEY `company_name` (`company_name`),
+  ADD KEY `job_title` (`job_title`),
+  ADD KEY `start_date` (`start_date`);
+
+--
+-- Indexes for table `li_skill`
+--
+ALTER TABLE `li_skill`
+  ADD PRIMARY KEY (`profile_key`,`skill`),
+  ADD KEY `skill` (`skill`);
+
+--
+-- Indexes for table `scrape_jobs`
+--
+ALTER TABLE `scrape_jobs`
+  ADD PRIMARY KEY (`profile_key`),
+  ADD KEY `state` (`state`,`created_at`),
+  ADD KEY `lease` (`state`,`lease_expires`),
+  ADD KEY `lease_owner` (`lease_owner`),
+  ADD KEY `claim_token` (`claim_token`);
 COMMIT;
 
 /*!40101 SET CHARACTER_SET_CLIENT=@OLD_CHARACTER_SET_CLIENT */;
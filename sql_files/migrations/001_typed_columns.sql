@@ -0,0 +1,28 @@
+--
+-- Typed columns parsed from the display strings by normalize.py:
+-- connections/followers counts, first role start/end dates and durations in months.
+--
+
+START TRANSACTION;
+
+ALTER TABLE `li_person`
+  ADD COLUMN `connections_count` int(11) DEFAULT NULL AFTER `experience_json`,
+  ADD COLUMN `followers_count` int(11) DEFAULT NULL AFTER `connections_count`,
+  ADD COLUMN `start_date` date DEFAULT NULL AFTER `followers_count`,
+  ADD COLUMN `end_date` date DEFAULT NULL AFTER `start_date`,
+  ADD COLUMN `is_current` tinyint(1) DEFAULT NULL AFTER `end_date`,
+  ADD COLUMN `duration_months` smallint(6) DEFAULT NULL AFTER `is_current`,
+  ADD COLUMN `total_duration_months` smallint(6) DEFAULT NULL AFTER `duration_months`;
+
+ALTER TABLE `li_person_master`
+  ADD COLUMN `connections_count` int(11) DEFAULT NULL AFTER `experience_json`,
+  ADD COLUMN `followers_count` int(11) DEFAULT NULL AFTER `connections_count`,
+  ADD COLUMN `start_date` date DEFAULT NULL AFTER `followers_count`,
+  ADD COLUMN `end_date` date DEFAULT NULL AFTER `start_date`,
+  ADD COLUMN `is_current` tinyint(1) DEFAULT NULL AFTER `end_date`,
+  ADD COLUMN `duration_months` smallint(6) DEFAULT NULL AFTER `is_current`,
+  ADD COLUMN `total_duration_months` smallint(6) DEFAULT NULL AFTER `duration_months`,
+  ADD KEY `start_date` (`start_date`),
+  ADD KEY `connections_count` (`connections_count`);
+
+COMMIT;
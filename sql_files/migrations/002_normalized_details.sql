@@ -0,0 +1,51 @@
+--
+-- Canonical profile key and normalized experience and skill tables.
+--
+-- profile_key is the SHA-1 hex of the canonical profile URL (normalize.profile_key).
+-- Apply with `python migrate.py`, which runs this file, backfills profile_key,
+-- li_experience and li_skill from the existing rows in Python (MariaDB 10.4 has
+-- no JSON_TABLE to unpack experience_json), then runs 003_profile_key_primary.sql.
+--
+
+START TRANSACTION;
+
+ALTER TABLE `li_person`
+  ADD COLUMN `profile_key` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `task_id`,
+  ADD KEY `profile_key` (`profile_key`);
+
+ALTER TABLE `li_person_master`
+  ADD COLUMN `profile_key` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `task_id`;
+
+CREATE TABLE `li_experience` (
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  `position` smallint(6) NOT NULL,
+  `task_id` varchar(30) NOT NULL,
+  `job_title` varchar(100) NOT NULL,
+  `company_name` varchar(120) NOT NULL,
+  `company_link` text NOT NULL,
+  `location` varchar(150) NOT NULL,
+  `work_mode` varchar(50) NOT NULL,
+  `job_type` varchar(50) NOT NULL,
+  `total_duration` varchar(50) NOT NULL,
+  `duration` varchar(50) NOT NULL,
+  `tenurity` varchar(50) NOT NULL,
+  `start_date` date DEFAULT NULL,
+  `end_date` date DEFAULT NULL,
+  `is_current` tinyint(1) DEFAULT NULL,
+  `duration_months` smallint(6) DEFAULT NULL,
+  PRIMARY KEY (`profile_key`, `position`),
+  KEY `company_name` (`company_name`),
+  KEY `job_title` (`job_title`),
+  KEY `start_date` (`start_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE `li_skill` (
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  `position` smallint(6) NOT NULL,
+  `task_id` varchar(30) NOT NULL,
+  `skill` varchar(150) NOT NULL,
+  PRIMARY KEY (`profile_key`, `skill`),
+  KEY `skill` (`skill`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+COMMIT;
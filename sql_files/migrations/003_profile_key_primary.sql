@@ -0,0 +1,18 @@
+--
+-- Key li_person_master by profile_key instead of task_id, replacing the hash
+-- unique index on the TEXT profile_url. Needs profile_key backfilled and
+-- duplicate profiles removed first; migrate.py does both.
+--
+
+START TRANSACTION;
+
+ALTER TABLE `li_person`
+  MODIFY `profile_key` char(40) CHARACTER SET ascii NOT NULL;
+
+ALTER TABLE `li_person_master`
+  MODIFY `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  DROP PRIMARY KEY,
+  ADD PRIMARY KEY (`profile_key`),
+  DROP INDEX `person_link`;
+
+COMMIT;
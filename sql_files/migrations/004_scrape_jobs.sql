@@ -0,0 +1,28 @@
+--
+-- Shared job queue for running several scraper nodes against one database
+-- (cli.py --queue mysql, coordinator.py). Mirrors the local SQLite queue in
+-- job_queue.py; lease times are in server time.
+--
+
+START TRANSACTION;
+
+CREATE TABLE `scrape_jobs` (
+  `profile_key` char(40) CHARACTER SET ascii NOT NULL,
+  `profile_url` varchar(255) NOT NULL,
+  `source_url` text NOT NULL,
+  `state` enum('pending','running','done','failed') NOT NULL DEFAULT 'pending',
+  `attempts` tinyint(4) NOT NULL DEFAULT 0,
+  `lease_owner` varchar(100) DEFAULT NULL,
+  `claim_token` char(32) CHARACTER SET ascii DEFAULT NULL,
+  `lease_expires` datetime DEFAULT NULL,
+  `last_error` text DEFAULT NULL,
+  `created_at` timestamp(3) NOT NULL DEFAULT current_timestamp(3),
+  `updated_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`profile_key`),
+  KEY `state` (`state`, `created_at`),
+  KEY `lease` (`state`, `lease_expires`),
+  KEY `lease_owner` (`lease_owner`),
+  KEY `claim_token` (`claim_token`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+COMMIT;
@@ -0,0 +1,28 @@
+--
+-- Per-section change detection (normalize.section_fingerprints).
+--
+-- Each capture stores a SHA-1 fingerprint of its basic info, experience and
+-- skills, and which of those differ from the previous capture. A re-scrape
+-- whose fingerprints all match only moves last_seen_at and last_activity.
+-- Rows captured before this migration have no fingerprints, so their next
+-- capture counts as changed in every section.
+--
+
+START TRANSACTION;
+
+ALTER TABLE `li_person`
+  ADD COLUMN `fingerprint_basic` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `total_duration_months`,
+  ADD COLUMN `fingerprint_experience` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `fingerprint_basic`,
+  ADD COLUMN `fingerprint_skills` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `fingerprint_experience`,
+  ADD COLUMN `changed_sections` set('basic','experience','skills') NOT NULL DEFAULT '' AFTER `fingerprint_skills`;
+
+ALTER TABLE `li_person_master`
+  ADD COLUMN `fingerprint_basic` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `total_duration_months`,
+  ADD COLUMN `fingerprint_experience` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `fingerprint_basic`,
+  ADD COLUMN `fingerprint_skills` char(40) CHARACTER SET ascii DEFAULT NULL AFTER `fingerprint_experience`,
+  ADD COLUMN `changed_sections` set('basic','experience','skills') NOT NULL DEFAULT '' AFTER `fingerprint_skills`,
+  ADD COLUMN `last_seen_at` timestamp NULL DEFAULT NULL AFTER `updated_at`;
+
+UPDATE `li_person_master` SET `last_seen_at` = COALESCE(`updated_at`, `inserted_at`);
+
+COMMIT;
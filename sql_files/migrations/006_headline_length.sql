@@ -0,0 +1,12 @@
+--
+-- LinkedIn headlines run to 220 characters. They used to be stored as ""
+-- (prepare_profile_for_db read a key that did not exist), so varchar(150)
+-- never overflowed; now that the real headline is written, a longer one is
+-- "Data too long" under STRICT_TRANS_TABLES.
+--
+
+ALTER TABLE `li_person`
+  MODIFY `headline` varchar(255) NOT NULL;
+
+ALTER TABLE `li_person_master`
+  MODIFY `headline` varchar(255) NOT NULL;
@@ -0,0 +1,192 @@
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+from metrics import inc
+
+
+# Page loads per hour per session when LinkedIn is not pushing back, and the
+# floor the rate is cut down to while it is. A profile is one load, or three in
+# deep mode (the profile page and its two details pages).
+RATE_PER_HOUR = float(os.environ.get("LI_RATE_PER_HOUR", 120))
+MIN_RATE_PER_HOUR = float(os.environ.get("LI_MIN_RATE_PER_HOUR", 12))
+# Loads that may go out back to back after an idle spell.
+BURST = int(os.environ.get("LI_BURST", 3))
+# Hard cap on page loads per session; 0 means no cap.
+SESSION_BUDGET = int(os.environ.get("LI_SESSION_BUDGET", 0))
+
+# On a throttle page the rate is multiplied by BACKOFF_FACTOR and loads pause
+# for a cooldown that doubles with every consecutive throttle. Each success
+# then adds RAMP_STEP of the full rate back.
+BACKOFF_FACTOR = 0.5
+RAMP_STEP = 0.05
+COOLDOWN_SECONDS = 120
+MAX_COOLDOWN_SECONDS = 30 * 60
+# Times a profile is retried after a throttle page before it counts as failed.
+THROTTLE_RETRIES = 2
+
+RATE_LIMITED = "rate_limited"
+CHECKPOINT = "checkpoint"
+AUTHWALL = "authwall"
+LOGGED_OUT = "logged_out"
+
+# First path segment of interstitial pages (/checkpoint/challenge/...,
+# /authwall?..., /uas/login?..., /login?...). Whole segments, so a profile
+# such as /in/loginov-... or /in/challenger-... is never mistaken for one.
+BLOCK_URL_SEGMENTS = {
+    "checkpoint": CHECKPOINT,
+    "challenge": CHECKPOINT,
+    "authwall": AUTHWALL,
+    "uas": LOGGED_OUT,
+    "login": LOGGED_OUT,
+}
+BLOCK_TEXT_MARKERS = [
+    ("too many requests", RATE_LIMITED),
+    ("request denied", RATE_LIMITED),
+    ("you've reached the", RATE_LIMITED),
+    ("quick security check", CHECKPOINT),
+    ("unusual activity", CHECKPOINT),
+    ("sign in to view", AUTHWALL),
+    ("join now to see", AUTHWALL),
+]
+# A checkpoint or login wall needs a person; no point retrying it soon.
+SEVERE_BLOCKS = {CHECKPOINT, AUTHWALL, LOGGED_OUT}
+
+
+class ThrottledError(RuntimeError):
+
+    def __init__(self, kind, url=""):
+        super().__init__(f"LinkedIn served a {kind.replace('_', ' ')} page instead of the profile ({url})")
+        self.kind = kind
+        self.url = url
+
+
+class BudgetExhaustedError(RuntimeError):
+    pass
+
+
+def blocked_url_kind(url):
+    segment = urlsplit(url).path.lower().strip("/").split("/")[0]
+    return BLOCK_URL_SEGMENTS.get(segment)
+
+
+def detect_block(driver):
+    # Returns the kind of interstitial the browser is on, or None. Called only
+    # when a profile did not render, so the extra round trips are off the
+    # normal path.
+    try:
+        url = driver.current_url
+    except WebDriverException:
+        return None
+    kind = blocked_url_kind(url)
+    if kind:
+        return kind
+
+    try:
+        text = f"{driver.title}\n{driver.find_element(By.TAG_NAME, 'body').text[:3000]}".lower()
+    except WebDriverException:
+        return None
+    for marker, kind in BLOCK_TEXT_MARKERS:
+        if marker in text:
+            return kind
+    return None
+
+
+def raise_if_blocked(driver):
+    kind = detect_block(driver)
+    if kind:
+        raise ThrottledError(kind, driver.current_url)
+
+
+# Token bucket whose refill rate adapts to LinkedIn's responses: halved on
+# every throttle page (plus a growing cooldown), raised a little on every
+# success, never above rate_per_hour. Shared by all browsers of a session.
+# clock and sleep are injectable so it can run on simulated time.
+class AdaptiveThrottle:
+
+    def __init__(self, rate_per_hour=RATE_PER_HOUR, min_rate_per_hour=MIN_RATE_PER_HOUR,
+                 burst=BURST, budget=SESSION_BUDGET, cooldown=COOLDOWN_SECONDS,
+                 max_cooldown=MAX_COOLDOWN_SECONDS, clock=time.monotonic, sleep=time.sleep):
+        self.max_rate = rate_per_hour / 3600
+        self.min_rate = min(min_rate_per_hour, rate_per_hour) / 3600
+        self.burst = burst
+        self.budget = budget
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.clock = clock
+        self.sleep = sleep
+
+        self.rate = self.max_rate
+        self.tokens = float(burst)
+        self.issued = 0
+        self.throttles = 0
+        self.blocked_until = 0.0
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # _updated sits in the future while a cooldown runs; nothing accrues then.
+        if now > self._updated:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self):
+        # Takes a token and returns 0, or returns the seconds until one is due.
+        with self._lock:
+            if self.budget and self.issued >= self.budget:
+                raise BudgetExhaustedError(f"Session budget of {self.budget} page loads used up")
+            now = self.clock()
+            if now < self.blocked_until:
+                return self.blocked_until - now
+            self._refill(now)
+            # Tolerance: sleeping the exact delay can land a hair short of 1.
+            if self.tokens >= 1 - 1e-9:
+                self.tokens = max(0.0, self.tokens - 1)
+                self.issued += 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self, timeout=None):
+        deadline = None if timeout is None else self.clock() + timeout
+        while True:
+            delay = self.reserve()
+            if not delay:
+                return
+            if deadline is not None:
+                if self.clock() >= deadline:
+                    raise TimeoutError("No request budget became available in time")
+                delay = min(delay, deadline - self.clock())
+            self.sleep(delay)
+
+    def success(self):
+        with self._lock:
+            self.throttles = 0
+            self._refill(self.clock())
+            self.rate = min(self.max_rate, self.rate + self.max_rate * RAMP_STEP)
+
+    def throttled(self, kind=RATE_LIMITED):
+        with self._lock:
+            now = self.clock()
+            self.throttles += 1
+            self.rate = max(self.min_rate, self.rate * BACKOFF_FACTOR)
+            if kind in SEVERE_BLOCKS:
+                pause = self.max_cooldown
+            else:
+                pause = min(self.max_cooldown, self.cooldown * 2 ** (self.throttles - 1))
+            self.blocked_until = max(self.blocked_until, now + pause)
+            self.tokens = 0.0
+            self._updated = self.blocked_until
+        inc("throttled_total", kind=kind)
+        return pause
+
+    def state(self):
+        with self._lock:
+            return {
+                "rate_per_hour": self.rate * 3600,
+                "tokens": self.tokens,
+                "cooldown": max(0.0, self.blocked_until - self.clock()),
+                "issued": self.issued,
+            }
@@ -0,0 +1,76 @@
+import queue
+import threading
+import time
+
+from metrics import inc
+
+
+WRITE_QUEUE_SIZE = 100
+WRITE_RETRIES = 3
+# Seconds before the first retry; doubles on every further attempt.
+WRITE_RETRY_BACKOFF = 1.0
+
+_STOP = object()
+
+
+# Persists items on a background thread so callers never block on the database.
+# The queue is bounded: submit(block=False) returns False when it is full, which
+# callers use as the signal to stop producing until writes catch up.
+class WriteBehindQueue:
+
+    def __init__(self, write, max_size=WRITE_QUEUE_SIZE, retries=WRITE_RETRIES,
+                 backoff=WRITE_RETRY_BACKOFF, on_queued=None, on_written=None, on_failed=None):
+        self.write = write
+        self.retries = retries
+        self.backoff = backoff
+        self.on_queued = on_queued
+        self.on_written = on_written
+        self.on_failed = on_failed
+
+        self._queue = queue.Queue(maxsize=max_size)
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    def submit(self, item, block=True, timeout=None):
+        try:
+            self._queue.put(item, block=block, timeout=timeout)
+        except queue.Full:
+            return False
+        if self.on_queued:
+            self.on_queued(item)
+        return True
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                self._write_with_retry(item)
+            finally:
+                self._queue.task_done()
+
+    def _write_with_retry(self, item):
+        for attempt in range(self.retries + 1):
+            try:
+                self.write(item)
+            except Exception as e:
+                if attempt == self.retries:
+                    inc("failures_total", stage="write_behind")
+                    if self.on_failed:
+                        self.on_failed(item, e)
+                    return
+                inc("retries_total", kind="write_behind")
+                time.sleep(self.backoff * 2 ** attempt)
+            else:
+                if self.on_written:
+                    self.on_written(item)
+                return
+
+    def close(self, timeout=None):
+        # Drains everything already queued before the writer thread exits.
+        self._queue.put(_STOP)
+        self._thread.join(timeout)